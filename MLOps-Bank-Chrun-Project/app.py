@@ -1,12 +1,20 @@
-import pickle
+import os
+import time
 import numpy as np
 import pandas as pd
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g
 from src.logger import get_logger
 from alibi_detect.cd import KSDrift
 from src.feature_store import RedisFeatureStore
+from src.feature_cache import CachedFeatureStore
+from src.batch_scoring import score_features
+from src.fast_inference import FastPredictor
+from src.drift_monitor import DriftMonitor
+from src.reference_stats import reference_stats_exist, load_reference_stats
+from src.model_registry import ModelRegistry
+from config.model_config import FEATURE_NAMES
 from sklearn.preprocessing import StandardScaler
-from prometheus_client import start_http_server,Counter,Gauge
+from prometheus_client import Counter,Gauge,Histogram
 
 logger = get_logger(__name__)
 
@@ -15,27 +23,56 @@ app = Flask(__name__ , template_folder="templates") # Initializing flask app
 prediction_count = Counter('prediction_count', "Number of prediction count")
 drift_count = Counter('drift_count', 'Number of times drift is detected')
 
-MODEL_PATH = "artifacts/models/xgb_classifier.pkl"
-with open (MODEL_PATH, 'rb') as model_file:
-    model = pickle.load(model_file)
+# Latency buckets from 0.1ms to 2.5s : single-row stages are sub-millisecond, batch requests take longer
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+request_latency = Histogram('request_latency_seconds', 'Whole request latency', ['endpoint', 'status'], buckets=LATENCY_BUCKETS)
+stage_latency = Histogram('predict_stage_latency_seconds', 'Latency of each /predict stage', ['stage'], buckets=LATENCY_BUCKETS)
+startup_seconds = Gauge('startup_stage_seconds', 'Time spent in each startup stage', ['stage'], multiprocess_mode='max')
+# Scaled (z-score) inputs, so one set of buckets fits every feature
+feature_value = Histogram('feature_value_scaled', 'Distribution of scaled input feature values', ['feature'],
+                          buckets=(-3, -2, -1, -0.5, 0, 0.5, 1, 2, 3))
 
-FEATURE_NAMES= ['CreditScore', 'Gender', 'Age', 'Tenure', 'Balance', 'NumOfProducts', 'HasCrCard',
-'IsActiveMember', 'EstimatedSalary', 'Geography_Germany', 'Geography_Spain']
+MAX_BATCH_SIZE = 10000
 
-feature_store = RedisFeatureStore()
+feature_store = CachedFeatureStore(RedisFeatureStore(), max_entries=50000, ttl=300) # per-customer lookups served from memory
+feature_store.pin_version(refresh_interval=60) # reads stay on one version, moving to a newly published one within a minute
 scaler = StandardScaler()
 
 def fit_scaler_on_ref_data():
     entity_ids = feature_store.get_all_entity_ids()
-    all_features = feature_store.get_batch_features(entity_ids)
+    all_features, missing = feature_store.mget_features(entity_ids)
+    if missing:
+        logger.warning(f"Reference data is missing {len(missing)} entities")
 
     all_features_df = pd.DataFrame.from_dict(all_features, orient='index')[FEATURE_NAMES]
 
     scaler.fit(all_features_df)
     return scaler.transform(all_features_df)
 
-historica_data = fit_scaler_on_ref_data() #existing data on which model is trained
+# Persisted reference stats are memory-mapped in milliseconds; Redis is only scanned if training has not written them
+start_time = time.perf_counter()
+if reference_stats_exist():
+    scaler, historica_data = load_reference_stats()
+else:
+    logger.warning("Reference stats not found, fitting scaler on feature store data")
+    historica_data = fit_scaler_on_ref_data() #existing data on which model is trained
 ksd = KSDrift(x_ref=historica_data, p_val=0.05) #p_val high sensitivity
+startup_seconds.labels(stage='reference_load').set(time.perf_counter() - start_time)
+# Native model artifact, hot-swapped when training publishes a new version
+model_registry = ModelRegistry(check_interval=10, build_predictor=lambda model: FastPredictor(model, scaler))
+startup_seconds.labels(stage='model_load').set(model_registry.load_seconds)
+drift_monitor = DriftMonitor(ksd, drift_counter=drift_count, window_size=1000, min_samples=100, interval=60)
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    if 'request_start' in g and request.endpoint != 'metrics':
+        request_latency.labels(endpoint=request.endpoint or 'unknown', status=response.status_code).observe(time.perf_counter() - g.request_start)
+    return response
 
 
 @app.route('/')
@@ -45,55 +82,96 @@ def home():
 @app.route('/predict', methods=['POST']) #add /predict to index.html so form function will trigger predict function
 def predict():
     try:
-        data = request.form
-        CreditScore = float(data["CreditScore"])
-        Gender = int(data["Gender"])
-        Age = int(data["Age"])
-        Tenure = int(data["Tenure"])
-        Balance = float(data["Balance"])
-        NumOfProducts = int(data["NumOfProducts"])
-        HasCrCard = int(data["HasCrCard"])
-        IsActiveMember = int(data["IsActiveMember"])
-        EstimatedSalary = float(data["EstimatedSalary"])
-        Geography_Germany = int(data["Geography_Germany"])
-        Geography_Spain = int(data["Geography_Spain"])
-
-        features = pd.DataFrame([[CreditScore,Gender,Age,Tenure,Balance,NumOfProducts,HasCrCard,
-        IsActiveMember,EstimatedSalary,Geography_Germany,Geography_Spain]], columns=FEATURE_NAMES)
-        
-        # Data Drift Detection
-        features_scaled = scaler.transform(features)
-        drift =  ksd.predict(features_scaled)
-        print('Drift Response : ',drift)
-
-        drift_response = drift.get('data',{})
-        is_drift = drift_response.get('is_drift', None)
+        # One bundle per request, so a hot reload never mixes model versions mid-request
+        predictor = model_registry.current().predictor
 
-        if is_drift is not None and is_drift==1:
-            print('Drift Detected')
-            logger.info('Drift Detected')
+        # Fast path : form -> preallocated numpy row, no DataFrame or sklearn wrappers
+        with stage_latency.labels(stage='parse').time():
+            features = predictor.parse(request.form)
+        
+        with stage_latency.labels(stage='scale').time():
+            features_scaled = predictor.transform(features)
+        for name, value in zip(FEATURE_NAMES, features_scaled[0]):
+            feature_value.labels(feature=name).observe(value)
 
-            drift_count.inc() #by default increment number is 1
+        # Data Drift Detection runs on windows of recent inputs in the background
+        with stage_latency.labels(stage='drift_submit').time():
+            drift_monitor.submit(features_scaled)
 
-        prediction = model.predict(features)[0]
+        with stage_latency.labels(stage='inference').time():
+            prediction = predictor.predict(features)
         prediction_count.inc()
         
         result = "Churn" if prediction==1 else "Stay"
 
-        return render_template('index.html', prediction_text = f"The predicton is : {result}")
+        with stage_latency.labels(stage='render').time():
+            return render_template('index.html', prediction_text = f"The predicton is : {result}")
 
     except Exception as e:
         return jsonify({'error' : str(e)})
     
+# A customer must be a JSON object with a number for every model feature (booleans count as 0/1)
+def is_valid_customer(customer):
+    return isinstance(customer, dict) and all(isinstance(customer.get(name), (int, float)) for name in FEATURE_NAMES)
+
+# JSON body : {"customers": [{feature: value, ...}, ...]} and/or {"customer_ids": [...]} resolved through the feature store
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        payload = request.get_json(force=True) or {}
+        customers = payload.get("customers", [])
+        customer_ids = payload.get("customer_ids", [])
+
+        if not isinstance(customers, list) or not isinstance(customer_ids, list):
+            return jsonify({'error' : "customers and customer_ids must be lists"}), 400
+
+        if len(customers) + len(customer_ids) > MAX_BATCH_SIZE:
+            return jsonify({'error' : f"Batch size is limited to {MAX_BATCH_SIZE} customers"}), 400
+
+        invalid = [i for i, customer in enumerate(customers) if not is_valid_customer(customer)]
+        if invalid:
+            return jsonify({'error' : f"Customers at positions {invalid[:10]} must be objects with numeric values for {FEATURE_NAMES}",
+                            'invalid_positions' : invalid}), 400
+
+        missing = []
+        keys = [customer.get("CustomerId") for customer in customers]
+        features_list = list(customers)
+        if customer_ids:
+            found, missing = feature_store.mget_cached(customer_ids)
+            for customer_id in customer_ids:
+                if customer_id in found:
+                    keys.append(customer_id)
+                    features_list.append(found[customer_id])
+
+        results = []
+        if features_list:
+            probabilities, predictions = score_features(model_registry.current().model, features_list)
+            prediction_count.inc(len(features_list))
+            results = [
+                {"CustomerId": key, "churn_probability": round(float(probability), 6),
+                 "prediction": "Churn" if prediction == 1 else "Stay"}
+                for key, probability, prediction in zip(keys, probabilities, predictions)
+            ]
+
+        return jsonify({"predictions": results, "missing_customer_ids": missing})
+
+    except Exception as e:
+        return jsonify({'error' : str(e)}), 500
+
 @app.route('/metrics')
 def metrics():
-    from prometheus_client import generate_latest
+    from prometheus_client import generate_latest, CollectorRegistry, multiprocess
     from flask import Response
+    # Under gunicorn every worker writes its metrics to PROMETHEUS_MULTIPROC_DIR; they are merged here
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), content_type='text/plain')
     #Prometheus cannot understand html, so using text/plain
     return Response(generate_latest(), content_type='text/plain') 
     
+# Development server only; production runs `gunicorn -c gunicorn.conf.py app:app` (metrics stay on /metrics)
 if __name__=='__main__':
-    start_http_server(8000) #run prometheus before running flask app
     app.run(debug=True,host='0.0.0.0', port=5000)
 
     
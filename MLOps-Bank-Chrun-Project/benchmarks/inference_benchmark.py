@@ -0,0 +1,89 @@
+import time
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from src.fast_inference import FastPredictor, FEATURE_SPEC
+from config.model_config import MODEL_PATH, FEATURE_NAMES
+
+# Micro-benchmark of the single-row /predict hot path (parse, scale, predict) :
+# the DataFrame + sklearn path app.py used before against FastPredictor.
+# Drift detection is left out, it is the same call in both paths.
+# Run from the project root : python -m benchmarks.inference_benchmark
+
+
+def random_forms(n, rng):
+    forms = []
+    for _ in range(n):
+        forms.append({
+            'CreditScore': str(rng.integers(350, 850)),
+            'Gender': str(rng.integers(0, 2)),
+            'Age': str(rng.integers(18, 70)),
+            'Tenure': str(rng.integers(0, 11)),
+            'Balance': f"{rng.uniform(0, 200000):.2f}",
+            'NumOfProducts': str(rng.integers(1, 4)),
+            'HasCrCard': str(rng.integers(0, 2)),
+            'IsActiveMember': str(rng.integers(0, 2)),
+            'EstimatedSalary': f"{rng.uniform(10, 200000):.2f}",
+            'Geography_Germany': str(rng.integers(0, 2)),
+            'Geography_Spain': str(rng.integers(0, 2)),
+        })
+    return forms
+
+
+def legacy_path(model, scaler, data):
+    features = pd.DataFrame([[cast(data[name]) for _, name, cast in FEATURE_SPEC]], columns=FEATURE_NAMES)
+    scaler.transform(features)
+    return model.predict(features)[0]
+
+
+def fast_path(predictor, data):
+    row = predictor.parse(data)
+    predictor.transform(row)
+    return predictor.predict(row)
+
+
+def measure(fn, forms, warmup=100):
+    for data in forms[:warmup]:
+        fn(data)
+    timings = np.empty(len(forms))
+    for i, data in enumerate(forms):
+        start = time.perf_counter()
+        fn(data)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with open(MODEL_PATH, 'rb') as model_file:
+        model = pickle.load(model_file)
+
+    rng = np.random.default_rng(40)
+    forms = random_forms(args.requests, rng)
+    reference = pd.DataFrame([[cast(f[name]) for _, name, cast in FEATURE_SPEC] for f in forms], columns=FEATURE_NAMES)
+    scaler = StandardScaler().fit(reference)
+
+    predictor = FastPredictor(model, scaler)
+    mismatches = sum(legacy_path(model, scaler, f) != fast_path(predictor, f) for f in forms[:1000])
+
+    results = {
+        "legacy (DataFrame + sklearn)": measure(lambda f: legacy_path(model, scaler, f), forms),
+        "fast (numpy + inplace_predict)": measure(lambda f: fast_path(predictor, f), forms),
+    }
+
+    print(f"{'path':<32}{'p50 (us)':>12}{'p99 (us)':>12}")
+    for name, timings in results.items():
+        print(f"{name:<32}{np.percentile(timings, 50):>12.1f}{np.percentile(timings, 99):>12.1f}")
+    legacy_p50 = np.percentile(results["legacy (DataFrame + sklearn)"], 50)
+    fast_p50 = np.percentile(results["fast (numpy + inplace_predict)"], 50)
+    print(f"p50 speedup : {legacy_p50 / fast_p50:.1f}x, prediction mismatches on 1000 rows : {mismatches}")
+    assert mismatches == 0, f"Fast path disagrees with model.predict on {mismatches} rows"
+
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+import urllib.request
+import urllib.parse
+from multiprocessing import Pool
+
+# Load test of /predict under gunicorn : starts the app with each worker count, hammers it from
+# client processes for a fixed duration and prints throughput, so scaling with cores is visible.
+# Run from the project root (Redis and the model artifacts must be available) :
+#   python -m benchmarks.load_test --workers 1 2 4 --clients 16 --duration 20
+
+FORM = urllib.parse.urlencode({
+    'CreditScore': 650, 'Gender': 1, 'Age': 40, 'Tenure': 5, 'Balance': 60000.0, 'NumOfProducts': 2,
+    'HasCrCard': 1, 'IsActiveMember': 1, 'EstimatedSalary': 100000.0, 'Geography_Germany': 0, 'Geography_Spain': 1,
+}).encode()
+
+
+def client(args):
+    url, duration = args
+    latencies = []
+    errors = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, data=FORM, timeout=10) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors += 1
+    return latencies, errors
+
+
+def wait_until_ready(url, timeout=120):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+            return
+        except Exception:
+            time.sleep(0.5)
+    raise RuntimeError(f"Server at {url} did not become ready in {timeout}s")
+
+
+def run(workers, clients, duration, threads, port):
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads), PORT=str(port))
+    server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        wait_until_ready(f"{base}/")
+        with Pool(clients) as pool:
+            results = pool.map(client, [(f"{base}/predict", duration)] * clients)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(errors for _, errors in results)
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float("nan")
+    return len(latencies) / duration, p50, p99, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=int, default=20)
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'errors':>8}")
+    for workers in args.workers:
+        throughput, p50, p99, errors = run(workers, args.clients, args.duration, args.threads, args.port)
+        print(f"{workers:>8}{throughput:>10.1f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__=="__main__":
+    main()
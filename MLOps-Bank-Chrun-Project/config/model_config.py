@@ -0,0 +1,8 @@
+MODEL_DIR = "artifacts/models/"
+MODEL_PATH = "artifacts/models/xgb_classifier.pkl"
+# Published model versions kept on disk (older ones are deleted on publish)
+MODEL_VERSIONS_TO_KEEP = 5
+
+# Model input columns, in the order the model was trained on
+FEATURE_NAMES = ['CreditScore', 'Gender', 'Age', 'Tenure', 'Balance', 'NumOfProducts', 'HasCrCard',
+'IsActiveMember', 'EstimatedSalary', 'Geography_Germany', 'Geography_Spain']
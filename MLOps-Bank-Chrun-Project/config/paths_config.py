@@ -1,6 +1,23 @@
 import os
 RAW_DIR = "artifacts/raw"
-TRAIN_PATH = os.path.join(RAW_DIR,'bankchurn_train.csv')
-TEST_PATH = os.path.join(RAW_DIR,'bankchurn_test.csv')
 
-PROCESSED_DIR = "artifacts/processed"
\ No newline at end of file
+# Format of the artifacts passed between pipeline stages : parquet (default), arrow (memory-mappable IPC) or csv
+ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "parquet")
+ARTIFACT_EXT = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}[ARTIFACT_FORMAT]
+
+TRAIN_PATH = os.path.join(RAW_DIR,f'bankchurn_train.{ARTIFACT_EXT}')
+TEST_PATH = os.path.join(RAW_DIR,f'bankchurn_test.{ARTIFACT_EXT}')
+
+# Incremental ingestion : rows changed since the last watermark
+TRAIN_DELTA_PATH = os.path.join(RAW_DIR,f'bankchurn_train_delta.{ARTIFACT_EXT}')
+TEST_DELTA_PATH = os.path.join(RAW_DIR,f'bankchurn_test_delta.{ARTIFACT_EXT}')
+INGESTION_STATE_PATH = os.path.join(RAW_DIR,'ingestion_state.json')
+
+PROCESSED_DIR = "artifacts/processed"
+
+# Offline batch scoring output
+PREDICTIONS_DIR = "artifacts/predictions"
+SCORES_PATH = os.path.join(PREDICTIONS_DIR,f'churn_scores.{ARTIFACT_EXT}')
+
+# Scaler parameters and reference sample for the serving app, written by model training
+REFERENCE_DIR = "artifacts/reference"
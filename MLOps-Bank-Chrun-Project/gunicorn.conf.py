@@ -0,0 +1,29 @@
+import os
+import shutil
+import multiprocessing
+
+# Production serving for the churn app :  gunicorn -c gunicorn.conf.py app:app
+# Tune with WEB_CONCURRENCY (worker processes), GUNICORN_THREADS (threads per worker) and PORT.
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+timeout = 30
+keepalive = 5
+
+# The model, scaler and reference sample are loaded once in the master and shared copy-on-write by workers
+preload_app = True
+
+# Every worker writes its metrics here and /metrics merges them; must be set before prometheus_client is imported
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/churn_app_metrics")
+
+# Values from a previous run would otherwise be merged into the new counters. Cleaned here, while the
+# config is read : with preload_app the app is imported (and writes its startup metrics) before on_starting
+shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
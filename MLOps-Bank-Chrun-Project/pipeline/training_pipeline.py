@@ -1,3 +1,4 @@
+import sys
 from src.data_ingestion import DataIngestion
 from src.data_processing import DataPreProcessing
 from src.model_training import ModelTraining
@@ -6,14 +7,22 @@ from config.paths_config import *
 from config.database_config import *
 
 if __name__=="__main__":
-    data_ingestion = DataIngestion(DB_CONFIG, RAW_DIR)
-    data_ingestion.run()
+    # --incremental : only customers changed since the last run are ingested and re-stored
+    incremental = "--incremental" in sys.argv
+
+    data_ingestion = DataIngestion(DB_CONFIG, RAW_DIR, incremental=incremental)
+    changed = data_ingestion.run()
 
     feature_store = RedisFeatureStore()
 
-    data_processor = DataPreProcessing(TRAIN_PATH, TEST_PATH, feature_store)
+    # The first incremental run (no watermark yet) is a full extraction into the regular train/test files
+    if incremental and changed is not None:
+        data_processor = DataPreProcessing(TRAIN_DELTA_PATH, TEST_DELTA_PATH, feature_store, incremental=True)
+    else:
+        data_processor = DataPreProcessing(TRAIN_PATH, TEST_PATH, feature_store)
     data_processor.run()
+    # The watermark only moves once the changed customers are stored
+    data_ingestion.commit_watermark()
 
-    feature_store = RedisFeatureStore()
     model_trainer = ModelTraining(feature_store)
-    model_trainer.run()
\ No newline at end of file
+    model_trainer.run()
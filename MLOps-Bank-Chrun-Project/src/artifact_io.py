@@ -0,0 +1,173 @@
+import os
+import csv
+import pandas as pd
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Formats are picked from the file extension : .parquet (zstd compressed), .arrow (Arrow IPC, memory-mappable) or .csv
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def artifact_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in FORMAT_EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError(f"Unsupported artifact format for {path}, expected one of {list(FORMAT_EXTENSIONS.values())}")
+
+
+def write_table(df, path, compression="zstd"):
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False, compression=compression)
+    else:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    logger.info(f"Saved {len(df)} rows to {path}")
+
+
+# A missing or empty artifact is an error, unless the caller expects it (missing_ok), e.g. an incremental
+# delta with no changes, which TableWriter does not write at all
+def _is_missing(path, missing_ok):
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        return False
+    if not missing_ok:
+        raise FileNotFoundError(f"Artifact {path} is missing or empty")
+    return True
+
+
+# columns : only these columns are read (projection pushed down for parquet/arrow)
+# required_columns : schema check, raises ValueError if any is missing
+# missing_ok : a missing or empty file reads as an empty frame instead of raising FileNotFoundError
+def read_table(path, columns=None, required_columns=None, missing_ok=False):
+    if _is_missing(path, missing_ok):
+        return pd.DataFrame(columns=columns)
+
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns)
+    elif fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        import pyarrow as pa
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        df = table.to_pandas()
+
+    _check_columns(df, path, required_columns)
+    return df
+
+
+def _check_columns(df, path, required_columns):
+    if required_columns is not None:
+        missing = [col for col in required_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Artifact {path} is missing columns {missing}")
+
+
+# Streaming counterpart of read_table : yields DataFrames of at most batch_size rows (parquet batches,
+# csv chunks; arrow yields the record batches as they were written), so memory does not grow with the table
+def iter_table(path, columns=None, required_columns=None, batch_size=10000, missing_ok=False):
+    if _is_missing(path, missing_ok):
+        return
+
+    fmt = artifact_format(path)
+    if fmt == "csv":
+        with pd.read_csv(path, usecols=columns, chunksize=batch_size) as reader:
+            for df in reader:
+                _check_columns(df, path, required_columns)
+                yield df
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        with pq.ParquetFile(path) as parquet_file:
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+                df = batch.to_pandas()
+                _check_columns(df, path, required_columns)
+                yield df
+    else:
+        import pyarrow as pa
+        with pa.memory_map(path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(i)])
+                if columns is not None:
+                    table = table.select(columns)
+                df = table.to_pandas()
+                _check_columns(df, path, required_columns)
+                yield df
+
+
+class TableWriter:
+    # Streaming writer : rows are appended batch by batch, so the whole table is never held in memory.
+    # The schema of the first batch is kept and later batches are cast to it.
+    # Rows go to a .tmp file that only replaces the artifact once the writer is closed without an error.
+    def __init__(self, path, compression="zstd"):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.fmt = artifact_format(path)
+        self.compression = compression
+        self.columns = None
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(discard=exc_type is not None)
+
+    def write_rows(self, columns, rows):
+        if not rows:
+            return
+        if self.columns is None:
+            self.columns = list(columns)
+
+        if self.fmt == "csv":
+            if self._writer is None:
+                self._file = open(self.tmp_path, "w", newline="")
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self.columns)
+            self._writer.writerows(rows)
+        else:
+            import pyarrow as pa
+            data = {col: [row[i] for row in rows] for i, col in enumerate(self.columns)}
+            table = pa.Table.from_pydict(data, schema=self._schema)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.tmp_path, self._schema, compression=self.compression)
+                else:
+                    self._file = pa.OSFile(self.tmp_path, "wb")
+                    self._writer = pa.ipc.new_file(self._file, self._schema)
+            self._writer.write_table(table)
+        self.rows += len(rows)
+
+    def close(self, discard=False):
+        if self._writer is not None and self.fmt != "csv":
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = None
+        self._file = None
+
+        if discard:
+            # Failed run : keep the previous artifact rather than a partial one
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+            return
+        if self.rows == 0:
+            # Nothing written : drop any output left by a previous run so readers see an empty table
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        os.replace(self.tmp_path, self.path)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+import weakref
+import redis.asyncio as aioredis
+from src.logger import get_logger
+from src.feature_codecs import get_codec, decode_result, fallback_positions
+from src.feature_store import RedisFeatureStore, ENTITY_INDEX_KEY, CURRENT_VERSION_KEY
+
+logger = get_logger(__name__)
+
+# asyncio connections belong to the loop that opened them, so pools are kept per event loop and dropped with it.
+# Within a loop, stores with the same server and pool settings share one pool.
+_pools = weakref.WeakKeyDictionary()
+
+# Blocking pool : once max_connections are in use, callers wait up to pool_timeout seconds for a free
+# connection instead of failing with "Too many connections"
+def get_async_pool(host="localhost", port=6379, db=0, max_connections=50, pool_timeout=30):
+    loop_pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    key = (host, port, db, max_connections, pool_timeout)
+    if key not in loop_pools:
+        # Raw bytes responses : feature values can be binary, ids are decoded where needed
+        loop_pools[key] = aioredis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=db,
+            max_connections=max_connections,
+            timeout=pool_timeout,
+            decode_responses=False
+        )
+        logger.info(f"Created async Redis pool for {host}:{port}/{db} (max {max_connections} connections)")
+    return loop_pools[key]
+
+
+def _to_str(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class AsyncRedisFeatureStore:
+    # asyncio counterpart of RedisFeatureStore with the same key layout, codecs and snapshot versions
+    # max_in_flight : chunk pipelines one call runs at once, so a large batch leaves connections for other callers
+    def __init__(self, host="localhost", port=6379, db=0, chunk_size=1000, max_connections=50, codec="json", version=None,
+                 max_in_flight=8):
+        self.pool_args = (host, port, db, max_connections)
+        self._client = None
+        self._loop = None
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.codec = get_codec(codec)
+        self.version = version
+
+    # Client on the pool of the running loop, so one store can be used from successive asyncio.run calls
+    @property
+    def client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = aioredis.Redis(connection_pool=get_async_pool(*self.pool_args))
+            self._loop = loop
+        return self._client
+
+    def _key(self, entity_id, version):
+        return f"{RedisFeatureStore._prefix(version)}entity:{entity_id}:features"
+
+    def _index_key(self, version):
+        return f"{RedisFeatureStore._prefix(version)}{ENTITY_INDEX_KEY}"
+
+    async def get_current_version(self):
+        version = await self.client.get(CURRENT_VERSION_KEY)
+        return int(version) if version is not None else None
+
+    async def _read_version(self):
+        return self.version if self.version is not None else await self.get_current_version()
+
+    async def pin_version(self, version=None):
+        self.version = version if version is not None else await self.get_current_version()
+        return self.version
+
+    async def _read_keys(self, keys):
+        first, fallback = (self._hgetall, self._mget) if self.codec.is_hash else (self._mget, self._hgetall)
+        results = await first(keys)
+        retry = fallback_positions(results, self.codec.is_hash)
+        if retry:
+            for i, value in zip(retry, await fallback([keys[i] for i in retry])):
+                results[i] = value
+        return [decode_result(result) for result in results]
+
+    async def _mget(self, keys):
+        return await self.client.mget(keys)
+
+    async def _hgetall(self, keys):
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return await pipe.execute(raise_on_error=False)
+
+    # Runs the chunk coroutines concurrently, at most max_in_flight at a time, results in input order
+    async def _gather_limited(self, coroutines):
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def run(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*[run(coroutine) for coroutine in coroutines])
+
+    async def get_features(self, entity_id):
+        key = self._key(entity_id, await self._read_version())
+        return (await self._read_keys([key]))[0]
+
+    # Chunks are fetched concurrently over the shared pool, max_in_flight at a time
+    async def mget_features(self, entity_ids, chunk_size=None):
+        chunk_size = chunk_size or self.chunk_size
+        version = await self._read_version()
+        entity_ids = list(entity_ids)
+        chunks = [entity_ids[i:i + chunk_size] for i in range(0, len(entity_ids), chunk_size)]
+        results = await self._gather_limited(
+            self._read_keys([self._key(entity_id, version) for entity_id in chunk]) for chunk in chunks
+        )
+
+        found = {}
+        missing = []
+        for chunk, values in zip(chunks, results):
+            for entity_id, value in zip(chunk, values):
+                if value:
+                    found[entity_id] = value
+                else:
+                    missing.append(entity_id)
+
+        if missing:
+            logger.warning(f"{len(missing)} of {len(entity_ids)} entities not found in feature store")
+        return found, missing
+
+    async def get_batch_features(self, entity_ids):
+        found, missing = await self.mget_features(entity_ids)
+        return {entity_id: found.get(entity_id) for entity_id in entity_ids}
+
+    async def _write_chunk(self, chunk, transaction, version):
+        pipe = self.client.pipeline(transaction=transaction)
+        for entity_id, features in chunk:
+            key = self._key(entity_id, version)
+            if self.codec.is_hash:
+                pipe.delete(key)
+                pipe.hset(key, mapping=self.codec.encode(features))
+            else:
+                pipe.set(key, self.codec.encode(features))
+        pipe.sadd(self._index_key(version), *[entity_id for entity_id, _ in chunk])
+        await pipe.execute()
+
+    async def store_features(self, entity_id, features):
+        await self._write_chunk([(entity_id, features)], True, await self._read_version())
+
+    async def store_batch_features(self, batch_data, chunk_size=None, transaction=False):
+        chunk_size = chunk_size or self.chunk_size
+        items = list(batch_data.items())
+        version = await self._read_version()
+
+        start_time = time.perf_counter()
+        await self._gather_limited(
+            self._write_chunk(items[i:i + chunk_size], transaction, version) for i in range(0, len(items), chunk_size)
+        )
+        elapsed = time.perf_counter() - start_time
+
+        rows_per_sec = len(items) / elapsed if elapsed > 0 else float(len(items))
+        logger.info(f"Stored {len(items)} entities in {elapsed:.3f}s ({rows_per_sec:.0f} rows/sec)")
+        return {"rows": len(items), "seconds": elapsed, "rows_per_sec": rows_per_sec}
+
+    async def iter_entity_ids(self, count=None):
+        count = count or self.chunk_size
+        index_key = self._index_key(await self._read_version())
+        async for entity_id in self.client.sscan_iter(index_key, count=count):
+            yield _to_str(entity_id)
+
+    async def get_all_entity_ids(self):
+        # SSCAN may return a member more than once
+        return list(dict.fromkeys([entity_id async for entity_id in self.iter_entity_ids()]))
+
+    # Disconnects the pool of the current loop; other stores sharing it reconnect on their next command
+    async def close(self):
+        if self._client is None:
+            return
+        await self._client.aclose()
+        await self._client.connection_pool.disconnect()
+        self._client = None
+        self._loop = None
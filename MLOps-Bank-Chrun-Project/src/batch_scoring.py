@@ -0,0 +1,88 @@
+import os
+import time
+import pickle
+import numpy as np
+import pandas as pd
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.feature_store import RedisFeatureStore
+from src.artifact_io import TableWriter
+from config.model_config import MODEL_PATH, FEATURE_NAMES
+from config.paths_config import *
+
+logger = get_logger(__name__)
+
+
+# Scoring a list of feature dicts with one vectorized predict_proba call
+def score_features(model, features_list, threshold=0.5):
+    x = pd.DataFrame.from_records(features_list, columns=FEATURE_NAMES)
+    probabilities = model.predict_proba(x)[:, 1]
+    predictions = (probabilities >= threshold).astype(int)
+    return probabilities, predictions
+
+
+class BatchScoring:
+    def __init__(self, feature_store: RedisFeatureStore, model_path=MODEL_PATH, output_path=SCORES_PATH,
+                 chunk_size=10000, threshold=0.5):
+        self.feature_store = feature_store
+        self.model_path = model_path
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+        self.model = None
+
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        logger.info("Batch Scoring initialized")
+
+    def load_model(self):
+        try:
+            with open(self.model_path, 'rb') as model_file:
+                self.model = pickle.load(model_file)
+            logger.info(f"Model loaded from {self.model_path}")
+        except Exception as e:
+            logger.error(f"Error while loading the model {e}")
+            raise CustomException(str(e))
+
+    def score_chunk(self, entity_ids, writer):
+        found, missing = self.feature_store.mget_features(entity_ids)
+        if not found:
+            return 0
+        ids = list(found.keys())
+        probabilities, predictions = score_features(self.model, [found[entity_id] for entity_id in ids], self.threshold)
+        rows = list(zip(ids, np.round(probabilities, 6).tolist(), predictions.tolist()))
+        writer.write_rows(["CustomerId", "churn_probability", "prediction"], rows)
+        return len(rows)
+
+    # Streams the whole customer base through the model chunk by chunk
+    def run(self):
+        try:
+            logger.info("Start of Batch Scoring")
+            self.load_model()
+            version = self.feature_store.pin_version()
+            logger.info(f"Scoring feature version {version}")
+
+            start_time = time.perf_counter()
+            chunk = []
+            with TableWriter(self.output_path) as writer:
+                for entity_id in self.feature_store.iter_entity_ids():
+                    chunk.append(entity_id)
+                    if len(chunk) >= self.chunk_size:
+                        self.score_chunk(chunk, writer)
+                        chunk = []
+                        logger.info(f"Scored {writer.rows} customers")
+                if chunk:
+                    self.score_chunk(chunk, writer)
+                total = writer.rows
+
+            elapsed = time.perf_counter() - start_time
+            logger.info(f"Scored {total} customers in {elapsed:.2f}s, results saved to {self.output_path}")
+            return total
+        except Exception as e:
+            logger.error(f"Error during Batch Scoring {e}")
+            raise CustomException(str(e))
+
+
+if __name__=="__main__":
+    feature_store = RedisFeatureStore()
+    batch_scoring = BatchScoring(feature_store)
+    batch_scoring.run()
@@ -3,17 +3,31 @@ import pandas as pd
 from src.logger import get_logger
 from src.custom_exception import CustomException
 import os
+import json
+import zlib
 from sklearn.model_selection import train_test_split
 import sys
+from src.artifact_io import write_table, TableWriter
 from config.database_config import DB_CONFIG
 from config.paths_config import *
 
 logger = get_logger(__name__)
 
 class DataIngestion:
-    def __init__(self, db_params, output_dir):
+    # streaming=True reads the table through a server-side cursor in chunks of chunk_size rows
+    # incremental=True only extracts rows whose updated_at is past the saved watermark (see extract_changes)
+    def __init__(self, db_params, output_dir, streaming=False, chunk_size=50000, test_size=0.2, split_column="CustomerId",
+                 incremental=False, watermark_column="updated_at"):
         self.db_params = db_params
         self.output_dir = output_dir
+        self.streaming = streaming
+        self.incremental = incremental
+        self.watermark_column = watermark_column
+        self.chunk_size = chunk_size
+        self.test_size = test_size
+        self.split_column = split_column
+        # Watermark of the last extract_changes, saved by commit_watermark once downstream stages succeed
+        self.pending_watermark = None
 
         os.makedirs(self.output_dir, exist_ok=True)
 
@@ -48,19 +62,120 @@ class DataIngestion:
     def save_data(self, df):
         try:
             train_df, test_df = train_test_split(df, test_size=0.2,random_state=40)
-            train_df.to_csv(TRAIN_PATH,index=False)
-            test_df.to_csv(TEST_PATH,index=False)
+            write_table(train_df, TRAIN_PATH)
+            write_table(test_df, TEST_PATH)
             logger.info("Data splitting and saving is done")
         except Exception as e:
             logger.error(f"Error when saving data {e}")
             raise CustomException(str(e))
 
+    # Deterministic split : a row goes to test when the hash of its key falls in the first test_size of buckets
+    def is_test_row(self, key):
+        return zlib.crc32(str(key).encode("utf-8")) % 10000 < self.test_size * 10000
+
+    def extract_and_save_streaming(self, query="SELECT * from public.bankchurn", params=None,
+                                   train_path=TRAIN_PATH, test_path=TEST_PATH):
+        try:
+            conn = self.connect_to_db()
+            train_rows = 0
+            test_rows = 0
+            # A named cursor keeps the result set on the server; only chunk_size rows are in memory at a time
+            with conn, conn.cursor(name="bankchurn_extract") as cursor, \
+                    TableWriter(train_path) as train_writer, TableWriter(test_path) as test_writer:
+                cursor.itersize = self.chunk_size
+                cursor.execute(query, params)
+                key_index = None
+
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        break
+                    if key_index is None:
+                        columns = [col[0] for col in cursor.description]
+                        key_index = columns.index(self.split_column)
+
+                    train_chunk = []
+                    test_chunk = []
+                    for row in rows:
+                        if self.is_test_row(row[key_index]):
+                            test_chunk.append(row)
+                        else:
+                            train_chunk.append(row)
+                    train_writer.write_rows(columns, train_chunk)
+                    test_writer.write_rows(columns, test_chunk)
+                    logger.info(f"Streamed {train_writer.rows + test_writer.rows} rows")
+
+                train_rows = train_writer.rows
+                test_rows = test_writer.rows
+            conn.close()
+            logger.info(f"Streaming extraction done : {train_rows} train rows, {test_rows} test rows")
+            return train_rows + test_rows
+        except Exception as e:
+            logger.error(f"Error while streaming data {e}")
+            raise CustomException(str(e))
+
+    def load_watermark(self):
+        if not os.path.exists(INGESTION_STATE_PATH):
+            return None
+        with open(INGESTION_STATE_PATH) as f:
+            return json.load(f).get("watermark")
+
+    def save_watermark(self, watermark):
+        with open(INGESTION_STATE_PATH, "w") as f:
+            json.dump({"watermark": watermark}, f)
+        logger.info(f"Ingestion watermark saved : {watermark}")
+
+    # Called after the extracted rows are stored; until then a failed run re-extracts the same changes
+    def commit_watermark(self):
+        if self.pending_watermark is not None:
+            self.save_watermark(self.pending_watermark)
+            self.pending_watermark = None
+
+    def fetch_max_watermark(self):
+        conn = self.connect_to_db()
+        with conn, conn.cursor() as cursor:
+            cursor.execute(f'SELECT max("{self.watermark_column}") from public.bankchurn')
+            watermark = cursor.fetchone()[0]
+        conn.close()
+        return watermark.isoformat() if watermark is not None else None
+
+    # Rows changed since the last run go to the delta files; the full train/test files are left as they are
+    def extract_changes(self):
+        try:
+            watermark = self.load_watermark()
+            # The new watermark is read before extracting, so rows updated during extraction are picked up next run
+            new_watermark = self.fetch_max_watermark()
+
+            if watermark is None:
+                # Seeding always uses the hash split that the deltas use, so a customer never switches sides
+                logger.info("No ingestion watermark found, running a full extraction")
+                self.extract_and_save_streaming()
+                changed = None
+            else:
+                query = f'SELECT * from public.bankchurn WHERE "{self.watermark_column}" > %s AND "{self.watermark_column}" <= %s'
+                changed = self.extract_and_save_streaming(query, (watermark, new_watermark),
+                                                          TRAIN_DELTA_PATH, TEST_DELTA_PATH)
+                logger.info(f"{changed} rows changed since {watermark}")
+
+            self.pending_watermark = new_watermark
+            return changed
+        except Exception as e:
+            logger.error(f"Error while extracting changed data {e}")
+            raise CustomException(str(e))
+
     def run(self):
         try:
             logger.info("Start of Data Ingestion pipeline")
-            df = self.extract_data()
-            self.save_data(df)
+            changed = None
+            if self.incremental:
+                changed = self.extract_changes()
+            elif self.streaming:
+                self.extract_and_save_streaming()
+            else:
+                df = self.extract_data()
+                self.save_data(df)
             logger.info("End of Ingestion Pipeline")
+            return changed
         except Exception as e:
             logger.error(f"Error when running Data Ingestion Pipeline {e}")
             raise CustomException(str(e))
@@ -1,17 +1,27 @@
 import sys
+import itertools
 import numpy as np
-import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn import preprocessing
 from src.feature_store import RedisFeatureStore
+from src.artifact_io import read_table, iter_table
 from src.logger import get_logger
 from src.custom_exception import CustomException
 from config.paths_config import *
 
 logger = get_logger(__name__)
 
+# CustomerId must stay first, it is used as the entity id
+FEATURE_COLUMNS = ["CustomerId", "Surname", "CreditScore", "Gender", "Age", "Tenure", "Balance",
+                   "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalary", "Exited",
+                   "Geography_Germany", "Geography_Spain"]
+
+# Columns read from the ingestion artifacts (extra columns such as RowNumber or updated_at are not loaded)
+RAW_COLUMNS = ["CustomerId", "Surname", "CreditScore", "Geography", "Gender", "Age", "Tenure", "Balance",
+               "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalary", "Exited"]
+
 class DataPreProcessing:
-    def __init__(self,train_data_path, test_data_path, feature_store : RedisFeatureStore):
+    def __init__(self,train_data_path, test_data_path, feature_store : RedisFeatureStore, export_chunk_size=10000,
+                 use_snapshot=True, keep_versions=2, incremental=False):
         self.train_data_path = train_data_path
         self.test_data_path = test_data_path
         self.data = None
@@ -25,25 +35,46 @@ class DataPreProcessing:
         self.y_resampled = None
 
         self.feature_store = feature_store
+        self.export_chunk_size = export_chunk_size
+        # Incremental runs get only changed rows, so they update the published version in place.
+        # Their delta files may be absent (no changes since the last run)
+        self.incremental = incremental
+        self.use_snapshot = use_snapshot and not incremental
+        self.keep_versions = keep_versions
         logger.info("Data Processing is initialized")
 
     def load_data(self):
         try:
-            self.data = pd.read_csv(self.train_data_path)
-            self.test_data = pd.read_csv(self.test_data_path)
+            self.data = read_table(self.train_data_path, columns=RAW_COLUMNS, required_columns=RAW_COLUMNS,
+                                   missing_ok=self.incremental)
+            self.test_data = read_table(self.test_data_path, columns=RAW_COLUMNS, required_columns=RAW_COLUMNS,
+                                        missing_ok=self.incremental)
             logger.info("Successfully read the data")
         except Exception as e:
             logger.error(f"Error while reading data {e}")
             raise CustomException(str(e))
         
+    # Raw train rows, export_chunk_size at a time; run() streams these so memory does not grow with the customer count
+    def iter_raw_chunks(self):
+        return iter_table(self.train_data_path, columns=RAW_COLUMNS, required_columns=RAW_COLUMNS,
+                          batch_size=self.export_chunk_size, missing_ok=self.incremental)
+
+    # Row-wise transforms only, so a chunk is processed the same as the whole table
+    @staticmethod
+    def preprocess(data):
+        # Explicit dummy columns (France is the dropped baseline), so a partial delta batch gets the same columns
+        data['Geography_Germany'] = (data['Geography'] == 'Germany').astype(int)
+        data['Geography_Spain'] = (data['Geography'] == 'Spain').astype(int)
+        data = data.drop('Geography',axis=1)
+        data['Gender'] = data['Gender'].map({'Female':0,'Male':1})
+        data['Age'] = np.where(data['Age']>70,70,data['Age'])
+        data['Balance'] = np.where(data['Balance']>200000,200000,data['Balance'])
+        data['NumOfProducts'] = np.where(data['NumOfProducts']>3,3,data['NumOfProducts'])
+        return data
+
     def preprocess_data(self):
         try:
-            self.data = pd.concat([self.data, pd.get_dummies(self.data['Geography'],prefix='Geography',drop_first=True)],axis=1).drop('Geography',axis=1)
-            self.data['Gender'] = self.data['Gender'].map({'Female':0,'Male':1})
-            self.data['Age'] = np.where(self.data['Age']>70,70,self.data['Age'])
-            self.data['Balance'] = np.where(self.data['Balance']>200000,200000,self.data['Balance'])
-            self.data['NumOfProducts'] = np.where(self.data['NumOfProducts']>3,3,self.data['NumOfProducts'])
-            
+            self.data = self.preprocess(self.data)
             logger.info("Data Preprocessing done...")
 
         except Exception as e:
@@ -51,29 +82,25 @@ class DataPreProcessing:
             raise CustomException(str(e))
         
 
-    def store_feature_in_redis(self):
+    # chunks : preprocessed DataFrames to export; defaults to self.data cut into export_chunk_size slices
+    def store_feature_in_redis(self, chunks=None):
         try:
-            batch_data = {}
-            for index,row in self.data.iterrows():
-                entity_id = row['CustomerId']
-                features = {
-                    "CustomerId" : row['CustomerId'],
-                    "Surname" : row['Surname'],
-                    "CreditScore" : row["CreditScore"],
-                    "Gender" : row["Gender"],
-                    "Age" : row["Age"],
-                    "Tenure": row["Tenure"],
-                    "Balance" : row["Balance"],
-                    "NumOfProducts" : row["NumOfProducts"],
-                    "HasCrCard" : row["HasCrCard"],
-                    "IsActiveMember" : row["IsActiveMember"],
-                    "EstimatedSalary" : row["EstimatedSalary"],
-                    "Exited" : row["Exited"],
-                    "Geography_Germany" : row["Geography_Germany"],
-                    "Geography_Spain" : row["Geography_Spain"],
-                }
-                batch_data[entity_id] = features
-            self.feature_store.store_batch_features(batch_data)
+            if chunks is None:
+                chunks = (self.data.iloc[start:start + self.export_chunk_size]
+                          for start in range(0, len(self.data), self.export_chunk_size))
+
+            total_rows = 0
+            for chunk in chunks:
+                # Column-wise tolist() converts numpy scalars to Python types once per column, not per cell
+                columns = [chunk[col].astype(int).tolist() if chunk[col].dtype == bool else chunk[col].tolist()
+                           for col in FEATURE_COLUMNS]
+                records = [dict(zip(FEATURE_COLUMNS, values)) for values in zip(*columns)]
+                batch_data = dict(zip(columns[0], records))
+
+                self.feature_store.store_batch_features(batch_data)
+                total_rows += len(batch_data)
+                logger.info(f"Exported {total_rows} rows to the Feature Store")
+
             logger.info("Data has been loaded into the Feature Store")
         except Exception as e:
             logger.error(f"Error while feature storing data {e}")
@@ -88,9 +115,26 @@ class DataPreProcessing:
     def run(self):
         try:
             logger.info("Start of Data Processing Pipeline")
-            self.load_data()
-            self.preprocess_data()
-            self.store_feature_in_redis()
+            # Read, preprocess and export one chunk at a time; the whole table is never held in memory
+            chunks = (self.preprocess(chunk) for chunk in self.iter_raw_chunks() if not chunk.empty)
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
+                logger.info("No rows to process, feature store left unchanged")
+                return
+            chunks = itertools.chain([first_chunk], chunks)
+
+            # Features are written to a new snapshot that readers only see once it is complete
+            if self.use_snapshot:
+                self.feature_store.begin_snapshot()
+                try:
+                    self.store_feature_in_redis(chunks)
+                except Exception:
+                    self.feature_store.abort_snapshot()
+                    raise
+                self.feature_store.publish_snapshot()
+                self.feature_store.gc_versions(keep=self.keep_versions)
+            else:
+                self.store_feature_in_redis(chunks)
             
             logger.info("End of Data Preprocessing")
 
@@ -0,0 +1,86 @@
+import os
+import threading
+from collections import deque
+import numpy as np
+from prometheus_client import Gauge
+from src.logger import get_logger
+from config.model_config import FEATURE_NAMES
+
+logger = get_logger(__name__)
+
+drift_p_value = Gauge('drift_p_value', 'KS test p-value of the latest drift window', ['feature'], multiprocess_mode='liveall')
+drift_detected = Gauge('drift_detected', '1 if the feature drifted in the latest window', ['feature'], multiprocess_mode='liveall')
+drift_window_size = Gauge('drift_window_size', 'Number of samples in the latest drift window', multiprocess_mode='liveall')
+
+
+class DriftMonitor:
+    # Keeps the last `window_size` scaled inputs and runs KSDrift on them in a background thread every
+    # `interval` seconds (once at least `min_samples` are collected), so /predict only appends a row.
+    def __init__(self, detector, drift_counter=None, window_size=1000, min_samples=100, interval=60):
+        self.detector = detector
+        self.drift_counter = drift_counter
+        self.min_samples = min_samples
+        self.interval = interval
+
+        self._window = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self._new_samples = 0
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self.last_result = None
+
+    # Called on the request path : copies the row (callers may reuse their buffers) and returns
+    def submit(self, features_scaled):
+        self._ensure_started()
+        with self._lock:
+            self._window.append(np.array(features_scaled, dtype=np.float64).reshape(-1))
+            self._new_samples += 1
+
+    # The worker thread is (re)started lazily, so it also runs in workers forked after import
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Drift check failed {e}")
+
+    def check(self):
+        with self._lock:
+            if len(self._window) < self.min_samples or self._new_samples == 0:
+                return None
+            window = np.vstack(self._window)
+            self._new_samples = 0
+
+        drift = self.detector.predict(window, return_p_val=True)
+        data = drift.get('data', {})
+        p_vals = np.atleast_1d(data.get('p_val', []))
+        threshold = data.get('threshold', 0.05)
+
+        drift_window_size.set(len(window))
+        for name, p_val in zip(FEATURE_NAMES, p_vals):
+            drift_p_value.labels(feature=name).set(float(p_val))
+            drift_detected.labels(feature=name).set(int(p_val < threshold))
+
+        if data.get('is_drift') == 1:
+            drifted = [name for name, p_val in zip(FEATURE_NAMES, p_vals) if p_val < threshold]
+            logger.info(f"Drift Detected on window of {len(window)} samples : {drifted}")
+            if self.drift_counter is not None:
+                self.drift_counter.inc()
+
+        self.last_result = data
+        return data
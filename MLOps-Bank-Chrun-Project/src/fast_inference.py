@@ -0,0 +1,68 @@
+import threading
+import numpy as np
+from config.model_config import FEATURE_NAMES
+
+# Parser per input field, in model column order
+FEATURE_TYPES = {
+    'CreditScore': float,
+    'Gender': int,
+    'Age': int,
+    'Tenure': int,
+    'Balance': float,
+    'NumOfProducts': int,
+    'HasCrCard': int,
+    'IsActiveMember': int,
+    'EstimatedSalary': float,
+    'Geography_Germany': int,
+    'Geography_Spain': int,
+}
+FEATURE_SPEC = [(index, name, FEATURE_TYPES[name]) for index, name in enumerate(FEATURE_NAMES)]
+
+
+# Trees to score with : up to best_iteration for an early-stopped model (as model.predict does), else all of them
+def iteration_range(model):
+    try:
+        return (0, model.best_iteration + 1)
+    except AttributeError:
+        return (0, 0)
+
+
+class FastPredictor:
+    # Single-row inference without pandas or sklearn wrappers : inputs are parsed straight into a
+    # preallocated per-thread numpy row, scaled with the scaler's raw parameters and scored with
+    # Booster.inplace_predict (no DMatrix construction)
+    def __init__(self, model, scaler=None, threshold=0.5):
+        # Own copy of the booster : nthread=1 must not leak into the model that batch scoring shares
+        self.booster = model.get_booster().copy()
+        # One row is too small to benefit from threads
+        self.booster.set_param({"nthread": 1})
+        self.iteration_range = iteration_range(model)
+        self.threshold = threshold
+        self.mean = scaler.mean_.astype(np.float64) if scaler is not None else None
+        self.scale = scaler.scale_.astype(np.float64) if scaler is not None else None
+        self._local = threading.local()
+
+    def _buffers(self):
+        if not hasattr(self._local, "row"):
+            self._local.row = np.empty((1, len(FEATURE_SPEC)), dtype=np.float64)
+            self._local.scaled = np.empty((1, len(FEATURE_SPEC)), dtype=np.float64)
+        return self._local.row, self._local.scaled
+
+    # Raises KeyError for a missing field and ValueError for a malformed one
+    def parse(self, data):
+        row, _ = self._buffers()
+        for index, name, cast in FEATURE_SPEC:
+            row[0, index] = cast(data[name])
+        return row
+
+    def transform(self, row):
+        _, scaled = self._buffers()
+        np.subtract(row, self.mean, out=scaled)
+        np.divide(scaled, self.scale, out=scaled)
+        return scaled
+
+    def predict_proba(self, row):
+        return float(self.booster.inplace_predict(row, iteration_range=self.iteration_range)[0])
+
+    def predict(self, row):
+        return int(self.predict_proba(row) >= self.threshold)
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from prometheus_client import Counter, Gauge, Histogram
+from src.feature_store import RedisFeatureStore
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+cache_hits = Counter('feature_cache_hits', 'Feature lookups served from the in-process cache')
+cache_misses = Counter('feature_cache_misses', 'Feature lookups that went to Redis')
+cache_evictions = Counter('feature_cache_evictions', 'Entries evicted from the feature cache (LRU)')
+lookup_latency = Histogram('feature_store_lookup_seconds', 'Latency of feature store reads on cache misses', ['operation'],
+                           buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+cache_size = Gauge('feature_cache_size', 'Entries currently held in the feature cache', multiprocess_mode='livesum')
+
+
+class CachedFeatureStore:
+    # Read-through LRU cache with TTL in front of RedisFeatureStore.get_features / get_batch_features.
+    # Missing entities are cached too (negative_ttl), so repeated lookups of unknown ids skip Redis.
+    # Everything else (writes, snapshots, bulk mget_features) is delegated to the wrapped store.
+    def __init__(self, feature_store: RedisFeatureStore, max_entries=10000, ttl=60, negative_ttl=5):
+        self.feature_store = feature_store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Writes done through the store in this process drop the matching entries right away;
+        # writes from other processes become visible after at most `ttl` seconds
+        feature_store.add_write_listener(self.invalidate)
+
+    def __getattr__(self, name):
+        return getattr(self.feature_store, name)
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, features = entry
+        if expires_at < now:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, features
+
+    def _put(self, key, features, now):
+        ttl = self.ttl if features is not None else self.negative_ttl
+        self._entries[key] = (now + ttl, features)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            cache_evictions.inc()
+        cache_size.set(len(self._entries))
+
+    def get_features(self, entity_id):
+        key = str(entity_id)
+        with self._lock:
+            found, features = self._lookup(key, time.monotonic())
+            if found:
+                self.hits += 1
+                cache_hits.inc()
+                return features
+
+        self.misses += 1
+        cache_misses.inc()
+        with lookup_latency.labels(operation='get').time():
+            features = self.feature_store.get_features(entity_id)
+        with self._lock:
+            self._put(key, features, time.monotonic())
+        return features
+
+    def mget_cached(self, entity_ids):
+        result = {}
+        to_fetch = []
+        with self._lock:
+            now = time.monotonic()
+            for entity_id in entity_ids:
+                found, features = self._lookup(str(entity_id), now)
+                if found:
+                    result[entity_id] = features
+                else:
+                    to_fetch.append(entity_id)
+
+        hits = len(result)
+        self.hits += hits
+        self.misses += len(to_fetch)
+        cache_hits.inc(hits)
+        cache_misses.inc(len(to_fetch))
+
+        if to_fetch:
+            with lookup_latency.labels(operation='mget').time():
+                fetched, missing = self.feature_store.mget_features(to_fetch)
+            with self._lock:
+                now = time.monotonic()
+                for entity_id in to_fetch:
+                    features = fetched.get(entity_id)
+                    self._put(str(entity_id), features, now)
+                    result[entity_id] = features
+
+        missing = [entity_id for entity_id in entity_ids if result.get(entity_id) is None]
+        return {entity_id: features for entity_id, features in result.items() if features is not None}, missing
+
+    def get_batch_features(self, entity_ids):
+        found, missing = self.mget_cached(entity_ids)
+        return {entity_id: found.get(entity_id) for entity_id in entity_ids}
+
+    def invalidate(self, entity_ids=None):
+        with self._lock:
+            if entity_ids is None:
+                self._entries.clear()
+            else:
+                for entity_id in entity_ids:
+                    self._entries.pop(str(entity_id), None)
+            cache_size.set(len(self._entries))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
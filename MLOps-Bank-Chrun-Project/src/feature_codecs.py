@@ -0,0 +1,163 @@
+import json
+import struct
+
+# Binary values start with a two byte tag; legacy JSON values start with '{' and carry no tag
+MSGPACK_TAG = b"\x00M"
+PACKED_TAG = b"\x00P"
+
+
+class FeatureSchema:
+    def __init__(self, version, fields):
+        # fields : list of (name, kind) where kind is 'float', 'int' or 'str'
+        self.version = version
+        self.fields = list(fields)
+        self.numeric_fields = [(name, kind) for name, kind in self.fields if kind != 'str']
+        self.str_fields = [name for name, kind in self.fields if kind == 'str']
+        self.numeric_struct = struct.Struct(f"<{len(self.numeric_fields)}d")
+
+
+CHURN_FEATURE_SCHEMA_V1 = FeatureSchema(1, [
+    ("CustomerId", "int"),
+    ("Surname", "str"),
+    ("CreditScore", "float"),
+    ("Gender", "int"),
+    ("Age", "float"),
+    ("Tenure", "int"),
+    ("Balance", "float"),
+    ("NumOfProducts", "int"),
+    ("HasCrCard", "int"),
+    ("IsActiveMember", "int"),
+    ("EstimatedSalary", "float"),
+    ("Exited", "int"),
+    ("Geography_Germany", "int"),
+    ("Geography_Spain", "int"),
+])
+
+FEATURE_SCHEMAS = {CHURN_FEATURE_SCHEMA_V1.version: CHURN_FEATURE_SCHEMA_V1}
+
+
+class JsonCodec:
+    name = "json"
+    is_hash = False
+
+    def encode(self, features):
+        return json.dumps(features).encode("utf-8")
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    is_hash = False
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("msgpack is required for the msgpack codec, run `pip install msgpack`") from e
+        self.msgpack = msgpack
+
+    def encode(self, features):
+        return MSGPACK_TAG + self.msgpack.packb(features, use_bin_type=True)
+
+
+class PackedCodec:
+    name = "packed"
+    is_hash = False
+
+    def __init__(self, schema=CHURN_FEATURE_SCHEMA_V1):
+        self.schema = schema
+        FEATURE_SCHEMAS.setdefault(schema.version, schema)
+
+    # Layout : tag | schema version (uint16) | float64 numeric block | length prefixed utf-8 strings
+    def encode(self, features):
+        schema = self.schema
+        numeric = schema.numeric_struct.pack(*[float(features[name]) for name, _ in schema.numeric_fields])
+        strings = b""
+        for name in schema.str_fields:
+            value = str(features[name]).encode("utf-8")
+            strings += struct.pack("<H", len(value)) + value
+        return PACKED_TAG + struct.pack("<H", schema.version) + numeric + strings
+
+
+class HashCodec:
+    name = "hash"
+    is_hash = True
+
+    # Each field is JSON encoded so ints, floats and strings round trip with their types
+    def encode(self, features):
+        return {name: json.dumps(value) for name, value in features.items()}
+
+    def decode(self, mapping):
+        return {_to_str(name): json.loads(value) for name, value in mapping.items()}
+
+
+def _to_str(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _decode_packed(payload):
+    (version,) = struct.unpack_from("<H", payload, 0)
+    schema = FEATURE_SCHEMAS.get(version)
+    if schema is None:
+        raise ValueError(f"Unknown feature schema version {version}")
+
+    offset = 2
+    numeric = schema.numeric_struct.unpack_from(payload, offset)
+    offset += schema.numeric_struct.size
+
+    features = {}
+    for (name, kind), value in zip(schema.numeric_fields, numeric):
+        features[name] = int(value) if kind == "int" else value
+    for name in schema.str_fields:
+        (length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        features[name] = payload[offset:offset + length].decode("utf-8")
+        offset += length
+
+    # Keep the original field order of the schema
+    return {name: features[name] for name, _ in schema.fields}
+
+
+# Decoding any string value, whatever codec wrote it
+def decode_value(raw):
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    tag = raw[:2]
+    if tag == PACKED_TAG:
+        return _decode_packed(raw[2:])
+    if tag == MSGPACK_TAG:
+        import msgpack
+        return msgpack.unpackb(raw[2:], raw=False)
+    return json.loads(raw)
+
+
+# Decoding one read result : a string value from any codec, a hash mapping, or a missing/unreadable key (None)
+def decode_result(result):
+    if not result or isinstance(result, Exception):
+        return None
+    if isinstance(result, dict):
+        return HashCodec().decode(result)
+    return decode_value(result)
+
+
+# Positions of a first read that must be re-read with the other command : nil MGET results may be hashes
+# (read with HGETALL), failed HGETALL results may be plain strings written before the hash codec (read with MGET)
+def fallback_positions(results, is_hash):
+    if is_hash:
+        return [i for i, result in enumerate(results) if isinstance(result, Exception)]
+    return [i for i, result in enumerate(results) if result is None]
+
+
+CODECS = {
+    "json": JsonCodec,
+    "msgpack": MsgpackCodec,
+    "packed": PackedCodec,
+    "hash": HashCodec,
+}
+
+
+def get_codec(codec):
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown feature codec '{codec}', expected one of {list(CODECS)}")
+        return CODECS[codec]()
+    return codec
@@ -1,42 +1,287 @@
 import redis
-import json
+import time
+from src.logger import get_logger
+from src.feature_codecs import get_codec, decode_result, fallback_positions
+
+logger = get_logger(__name__)
+
+ENTITY_INDEX_KEY = "entity:index"
+
+# Snapshot bookkeeping : published version pointer, version id sequence, published versions by time
+CURRENT_VERSION_KEY = "features:current_version"
+VERSION_SEQ_KEY = "features:version_seq"
+VERSIONS_KEY = "features:versions"
 
 class RedisFeatureStore:
-    def __init__(self, host="localhost", port=6379, db=0):
+    # codec : 'json' (default), 'msgpack', 'packed' or 'hash'; values written by any codec stay readable
+    # version : pin reads to a snapshot version; None follows the published version
+    def __init__(self, host="localhost", port=6379, db=0, chunk_size=1000, max_retries=3, codec="json", version=None):
         self.client = redis.StrictRedis(
             host=host,
             port=port,
             db=db,
             decode_responses=True
         )
+        # Feature values can be binary, so they are read through a client that returns raw bytes
+        self.data_client = redis.StrictRedis(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=False
+        )
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.codec = get_codec(codec)
+        self.version = version
+        self.refresh_interval = None
+        self._pinned_at = 0.0
+        self.write_version = None
+        self.write_listeners = []
+
+    # Callbacks run after visible writes with the changed entity ids, or None when every entity may have changed
+    def add_write_listener(self, callback):
+        self.write_listeners.append(callback)
+
+    def _notify_write(self, entity_ids):
+        for callback in self.write_listeners:
+            callback(entity_ids)
+
+    # Unversioned keys (written before snapshots existed) live without a prefix
+    @staticmethod
+    def _prefix(version):
+        return f"v{version}:" if version is not None else ""
+
+    def _key(self, entity_id, version):
+        return f"{self._prefix(version)}entity:{entity_id}:features"
+
+    def _index_key(self, version):
+        return f"{self._prefix(version)}{ENTITY_INDEX_KEY}"
+
+    def get_current_version(self):
+        version = self.client.get(CURRENT_VERSION_KEY)
+        return int(version) if version is not None else None
+
+    def _read_version(self):
+        if self.version is None:
+            return self.get_current_version()
+        if self.refresh_interval is not None and time.monotonic() - self._pinned_at >= self.refresh_interval:
+            self._refresh_pin()
+        return self.version
+
+    # A refreshing pin moves to the newly published version, so gc_versions never removes what it reads
+    def _refresh_pin(self):
+        self._pinned_at = time.monotonic()
+        current = self.get_current_version()
+        if current is not None and current != self.version:
+            logger.info(f"Feature store reads moved from version {self.version} to {current}")
+            self.version = current
+            self._notify_write(None)
+
+    # Writes go to the open snapshot, else to the version readers currently see
+    def _target_version(self):
+        return self.write_version if self.write_version is not None else self._read_version()
+
+    # Pinning keeps every read of this instance on one version, e.g. for a whole training run.
+    # Long-lived readers pass refresh_interval (seconds) to follow the published pointer : gc_versions
+    # keeps the previous version, so a refreshing reader never reads a collected one
+    def pin_version(self, version=None, refresh_interval=None):
+        self.version = version if version is not None else self.get_current_version()
+        self.refresh_interval = refresh_interval
+        self._pinned_at = time.monotonic()
+        self._notify_write(None)
+        logger.info(f"Feature store reads pinned to version {self.version}")
+        return self.version
+
+    def begin_snapshot(self):
+        self.write_version = int(self.client.incr(VERSION_SEQ_KEY))
+        logger.info(f"Writing feature snapshot version {self.write_version}")
+        return self.write_version
+
+    # Readers switch to the new snapshot with a single atomic SET of the pointer
+    def publish_snapshot(self):
+        if self.write_version is None:
+            raise ValueError("No snapshot in progress, call begin_snapshot() first")
+        version = self.write_version
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(CURRENT_VERSION_KEY, version)
+        pipe.zadd(VERSIONS_KEY, {version: time.time()})
+        pipe.execute()
+        self.write_version = None
+        self._notify_write(None)
+        logger.info(f"Published feature snapshot version {version}")
+        return version
+
+    def abort_snapshot(self):
+        if self.write_version is not None:
+            self._delete_version(self.write_version)
+            self.write_version = None
+
+    def list_versions(self):
+        return [int(version) for version in self.client.zrange(VERSIONS_KEY, 0, -1)]
+
+    # Dropping all but the newest `keep` published versions; the current version is never removed.
+    # Readers pinned without refresh_interval must not outlive `keep` publishes
+    def gc_versions(self, keep=2):
+        current = self.get_current_version()
+        versions = self.list_versions()
+        expired = [version for version in versions[:max(len(versions) - keep, 0)] if version != current]
+        for version in expired:
+            self._delete_version(version)
+            self.client.zrem(VERSIONS_KEY, version)
+        if expired:
+            logger.info(f"Garbage collected feature versions {expired}")
+        return expired
+
+    def _delete_version(self, version):
+        index_key = self._index_key(version)
+        batch = []
+        for entity_id in self.client.sscan_iter(index_key, count=self.chunk_size):
+            batch.append(self._key(entity_id, version))
+            if len(batch) >= self.chunk_size:
+                self.client.unlink(*batch)
+                batch = []
+        if batch:
+            self.client.unlink(*batch)
+        self.client.unlink(index_key)
+
+    def _queue_write(self, pipe, entity_id, features, version):
+        key = self._key(entity_id, version)
+        if self.codec.is_hash:
+            pipe.delete(key)
+            pipe.hset(key, mapping=self.codec.encode(features))
+        else:
+            pipe.set(key, self.codec.encode(features))
+
+    # Reading a list of keys in one round trip; None for missing keys
+    def _read_keys(self, keys):
+        first, fallback = (self._hgetall, self._mget) if self.codec.is_hash else (self._mget, self._hgetall)
+        results = first(keys)
+        retry = fallback_positions(results, self.codec.is_hash)
+        if retry:
+            for i, value in zip(retry, fallback([keys[i] for i in retry])):
+                results[i] = value
+        return [decode_result(result) for result in results]
+
+    def _mget(self, keys):
+        return self.data_client.mget(keys)
+
+    def _hgetall(self, keys):
+        pipe = self.data_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return pipe.execute(raise_on_error=False)
 
     # Storing data by row
     def store_features(self,entity_id,features):
-        key = f"entity:{entity_id}:features"
-        self.client.set(key, json.dumps(features))
+        version = self._target_version()
+        pipe = self.data_client.pipeline(transaction=True)
+        self._queue_write(pipe, entity_id, features, version)
+        pipe.sadd(self._index_key(version), entity_id)
+        pipe.execute()
+        if self.write_version is None:
+            self._notify_write([entity_id])
 
     # Getting rows in order
     def get_features(self,entity_id):
-        key = f"entity:{entity_id}:features"
-        features = self.client.get(key)
-        if features:
-            return json.loads(features)
-        return None
-    
-    def store_batch_features(self,batch_data):
-        for entity_id, features in batch_data.items():
-            self.store_features(entity_id,features)
+        key = self._key(entity_id, self._read_version())
+        return self._read_keys([key])[0]
+
+    # Sending one chunk of SETs in a single round trip, retrying the whole chunk on connection errors
+    def _write_chunk(self, chunk, transaction, version):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                pipe = self.data_client.pipeline(transaction=transaction)
+                for entity_id, features in chunk:
+                    self._queue_write(pipe, entity_id, features, version)
+                pipe.sadd(self._index_key(version), *[entity_id for entity_id, _ in chunk])
+                pipe.execute()
+                return
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Chunk write failed (attempt {attempt}/{self.max_retries}) {e}")
+                time.sleep(0.1 * 2 ** (attempt - 1))
+
+    # Storing rows in chunks; transaction=False skips MULTI/EXEC for the fastest bulk load
+    def store_batch_features(self,batch_data,chunk_size=None,transaction=False):
+        chunk_size = chunk_size or self.chunk_size
+        items = list(batch_data.items())
+        version = self._target_version()
+
+        start_time = time.perf_counter()
+        for i in range(0, len(items), chunk_size):
+            chunk = items[i:i + chunk_size]
+            self._write_chunk(chunk, transaction, version)
+            if self.write_version is None:
+                self._notify_write([entity_id for entity_id, _ in chunk])
+        elapsed = time.perf_counter() - start_time
+
+        rows_per_sec = len(items) / elapsed if elapsed > 0 else float(len(items))
+        logger.info(f"Stored {len(items)} entities in {elapsed:.3f}s ({rows_per_sec:.0f} rows/sec)")
+        return {"rows": len(items), "seconds": elapsed, "rows_per_sec": rows_per_sec}
+
+    # Reading rows with one MGET per chunk; returns (found features, missing entity ids)
+    def mget_features(self,entity_ids,chunk_size=None):
+        chunk_size = chunk_size or self.chunk_size
+        version = self._read_version()
+        entity_ids = list(entity_ids)
+        found = {}
+        missing = []
+        for i in range(0, len(entity_ids), chunk_size):
+            chunk = entity_ids[i:i + chunk_size]
+            values = self._read_keys([self._key(entity_id, version) for entity_id in chunk])
+            for entity_id, value in zip(chunk, values):
+                if value:
+                    found[entity_id] = value
+                else:
+                    missing.append(entity_id)
+
+        if missing:
+            logger.warning(f"{len(missing)} of {len(entity_ids)} entities not found in feature store")
+        return found, missing
 
     def get_batch_features(self,entity_ids):
-        batch_features={}
-        for entity_id in entity_ids:
-            batch_features[entity_id] = self.get_features(entity_id)
+        found, missing = self.mget_features(entity_ids)
+        batch_features = {entity_id: found.get(entity_id) for entity_id in entity_ids}
         return batch_features
-    
+
+    # Entity ids come from the index set maintained on every write
     def get_all_entity_ids(self):
-        keys = self.client.keys('entity:*:features')
+        version = self._read_version()
+        if not self.client.exists(self._index_key(version)):
+            logger.warning("Entity index is empty, rebuilding it from a keyspace scan")
+            self.rebuild_entity_index(version)
+        # SSCAN may return a member more than once if the set is rehashed during the scan
+        return list(dict.fromkeys(self.iter_entity_ids(version=version)))
+
+    # Incremental SSCAN over the index, so large listings don't block other clients
+    def iter_entity_ids(self, count=None, version=None):
+        count = count or self.chunk_size
+        version = version if version is not None else self._read_version()
+        for entity_id in self.client.sscan_iter(self._index_key(version), count=count):
+            yield entity_id
+
+    # Incremental SCAN over feature keys, for backfilling keys written before the index existed
+    def scan_entity_ids(self, count=None, version=None):
+        count = count or self.chunk_size
+        prefix = self._prefix(version)
+        for key in self.client.scan_iter(match=f'{prefix}entity:*:features', count=count):
+            # entity entity_id feature
+            yield key[len(prefix):].split(':')[1]
+
+    def rebuild_entity_index(self, version=None):
+        index_key = self._index_key(version)
+        total = 0
+        batch = []
+        for entity_id in self.scan_entity_ids(version=version):
+            batch.append(entity_id)
+            if len(batch) >= self.chunk_size:
+                self.client.sadd(index_key, *batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self.client.sadd(index_key, *batch)
+            total += len(batch)
+        logger.info(f"Entity index rebuilt with {total} entities")
+        return total
 
-        # entity entity_id feature
-        entity_ids = [key.split(':')[1] for key in keys]
-        return entity_ids
-    
\ No newline at end of file
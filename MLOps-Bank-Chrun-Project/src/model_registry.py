@@ -0,0 +1,133 @@
+import os
+import json
+import time
+import pickle
+import shutil
+import threading
+from datetime import datetime, timezone
+import xgboost as xgb
+from src.logger import get_logger
+from config.model_config import MODEL_DIR, MODEL_PATH, FEATURE_NAMES, MODEL_VERSIONS_TO_KEEP
+
+logger = get_logger(__name__)
+
+# Layout under MODEL_DIR :
+#   versions/<version>/model.ubj       native XGBoost booster (UBJSON), no pickle
+#   versions/<version>/manifest.json   feature order, metrics, training data hash
+#   LATEST                             name of the published version, replaced atomically
+VERSIONS_DIR = "versions"
+LATEST_FILE = "LATEST"
+MODEL_FILE = "model.ubj"
+MANIFEST_FILE = "manifest.json"
+
+
+# Deletes all but the newest `keep` versions (names start with a UTC timestamp, so they sort by age);
+# the published version is never deleted
+def prune_versions(model_dir, keep, published):
+    versions_dir = os.path.join(model_dir, VERSIONS_DIR)
+    versions = sorted(os.listdir(versions_dir))
+    for version in versions[:-keep] if keep > 0 else versions:
+        if version != published:
+            shutil.rmtree(os.path.join(versions_dir, version), ignore_errors=True)
+            logger.info(f"Deleted old model version {version}")
+
+
+def publish_model(model, metrics, data_hash, model_dir=MODEL_DIR, feature_names=FEATURE_NAMES, keep_versions=MODEL_VERSIONS_TO_KEEP):
+    # Microsecond timestamp : versions sort by age and a name is never reused, even after older ones are pruned
+    version = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}-{data_hash[:8]}"
+    version_dir = os.path.join(model_dir, VERSIONS_DIR, version)
+    # Fails rather than overwriting a version a server may be loading
+    os.makedirs(version_dir)
+
+    model.save_model(os.path.join(version_dir, MODEL_FILE))
+    with open(os.path.join(version_dir, MANIFEST_FILE), 'w') as f:
+        json.dump({
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "feature_names": list(feature_names),
+            "metrics": metrics,
+            "data_hash": data_hash,
+            "xgboost_version": xgb.__version__,
+        }, f, indent=2)
+
+    # Readers see either the old or the new pointer, never a half-written one
+    latest_tmp = os.path.join(model_dir, f"{LATEST_FILE}.tmp")
+    with open(latest_tmp, 'w') as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(model_dir, LATEST_FILE))
+    logger.info(f"Published model version {version}")
+
+    prune_versions(model_dir, keep_versions, version)
+    return version
+
+
+class ModelBundle:
+    # Everything derived from one model version; swapped as a whole so a request never mixes versions
+    def __init__(self, model, manifest, predictor=None):
+        self.model = model
+        self.manifest = manifest
+        self.version = manifest.get("version")
+        self.predictor = predictor
+
+
+class ModelRegistry:
+    # Loads the published model version and hot-swaps to a newer one without a restart.
+    # The LATEST pointer is checked at most every `check_interval` seconds from current(); only one
+    # thread reloads while the others keep serving the previous bundle, so no request is dropped.
+    # build_predictor : optional callable(model) -> predictor, built before the swap
+    def __init__(self, model_dir=MODEL_DIR, check_interval=10, build_predictor=None):
+        self.model_dir = model_dir
+        self.check_interval = check_interval
+        self.build_predictor = build_predictor
+        self._bundle = None
+        self._loaded_version = None
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.reload()
+
+    def _latest_version(self):
+        latest_path = os.path.join(self.model_dir, LATEST_FILE)
+        if not os.path.exists(latest_path):
+            return None
+        with open(latest_path) as f:
+            return f.read().strip()
+
+    def _load(self, version):
+        if version is None:
+            # No native artifact published yet : fall back to the pickled classifier
+            with open(MODEL_PATH, 'rb') as model_file:
+                model = pickle.load(model_file)
+            return model, {"version": None, "feature_names": FEATURE_NAMES}
+
+        version_dir = os.path.join(self.model_dir, VERSIONS_DIR, version)
+        with open(os.path.join(version_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest["feature_names"] != FEATURE_NAMES:
+            raise ValueError(f"Model {version} expects features {manifest['feature_names']}, app provides {FEATURE_NAMES}")
+        model = xgb.XGBClassifier()
+        model.load_model(os.path.join(version_dir, MODEL_FILE))
+        return model, manifest
+
+    def reload(self):
+        start_time = time.perf_counter()
+        version = self._latest_version()
+        model, manifest = self._load(version)
+        predictor = self.build_predictor(model) if self.build_predictor is not None else None
+        self._bundle = ModelBundle(model, manifest, predictor)
+        self._loaded_version = version
+        self.load_seconds = time.perf_counter() - start_time
+        logger.info(f"Model version {version} loaded in {self.load_seconds * 1000:.1f}ms")
+        return self._bundle
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval and self._reload_lock.acquire(blocking=False):
+            try:
+                self._last_check = now
+                if self._latest_version() != self._loaded_version:
+                    self.reload()
+            except Exception as e:
+                logger.error(f"Model reload failed, keeping version {self._loaded_version} {e}")
+            finally:
+                self._reload_lock.release()
+        return self._bundle
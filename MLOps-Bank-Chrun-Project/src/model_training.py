@@ -2,9 +2,16 @@ from src.logger import get_logger
 from src.custom_exception import CustomException
 import pandas as pd
 from src.feature_store import RedisFeatureStore
+from src.reference_stats import save_reference_stats
+from src.model_registry import publish_model
+from config.model_config import FEATURE_NAMES
 from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
 import xgboost as xgb
 import os
+import json
+import hashlib
 import pickle
 import sys
 from sklearn.metrics import confusion_matrix, classification_report, accuracy_score
@@ -13,10 +20,18 @@ from sklearn.metrics import precision_recall_fscore_support
 logger = get_logger(__name__)
 
 class ModelTraining:
-    def __init__(self, feature_store:RedisFeatureStore,model_save_path="artifacts/models/"):
+    # search_mode : 'halving' (successive halving with early stopping) or 'grid' (exhaustive GridSearchCV)
+    # xgb_threads : threads per XGBoost fit; sklearn runs cpu_count // xgb_threads fits in parallel
+    def __init__(self, feature_store:RedisFeatureStore,model_save_path="artifacts/models/",
+                 search_mode="halving", xgb_threads=1, early_stopping_rounds=20, use_tuning_cache=True):
         self.feature_store = feature_store
         self.model_save_path = model_save_path
         self.model = None
+        self.search_mode = search_mode
+        self.xgb_threads = xgb_threads
+        self.early_stopping_rounds = early_stopping_rounds
+        self.use_tuning_cache = use_tuning_cache
+        self.tuning_cache_dir = os.path.join(self.model_save_path, "tuning_cache")
 
         os.makedirs(self.model_save_path, exist_ok=True)
         logger.info("Model Training initialized")
@@ -25,13 +40,10 @@ class ModelTraining:
         try:
             logger.info("Extracting data from Redis")
 
-            data = []
-            for entity_id in entity_ids:
-                features = self.feature_store.get_features(entity_id)
-                if features:
-                    data.append(features)
-                else:
-                    logger.warning("Feature is not found")
+            found, missing = self.feature_store.mget_features(entity_ids)
+            if missing:
+                logger.warning(f"Features not found for {len(missing)} entities : {missing[:10]}")
+            data = [found[entity_id] for entity_id in entity_ids if entity_id in found]
             return data
         except Exception as e:
             logger.error(f"Error while loading data from Redis {e}")
@@ -39,7 +51,11 @@ class ModelTraining:
         
     def prepare_data(self):
         try:
-            entity_ids = self.feature_store.get_all_entity_ids()
+            # Train and test sets are read from one snapshot even if a refresh is published meanwhile
+            version = self.feature_store.pin_version()
+            logger.info(f"Training on feature version {version}")
+            # SSCAN order is arbitrary; sort so the split (and the tuning cache key) is reproducible
+            entity_ids = sorted(set(self.feature_store.get_all_entity_ids()), key=int)
 
             train_entity_ids, test_entity_ids = train_test_split(entity_ids,test_size=0.2,random_state=40)
 
@@ -65,6 +81,38 @@ class ModelTraining:
             logger.error(f"Error in preparing data for training {e}")
             raise CustomException(str(e))
             
+    # Cache key : content hash of the training data plus the grid and search settings
+    @staticmethod
+    def data_hash(x_train, y_train):
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(x_train, index=False).values.tobytes())
+        digest.update(pd.util.hash_pandas_object(y_train, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    def _tuning_cache_key(self, x_train, y_train, params):
+        digest = hashlib.sha256()
+        digest.update(self.data_hash(x_train, y_train).encode())
+        digest.update(json.dumps({"columns": list(x_train.columns), "params": params, "mode": self.search_mode,
+                                  "early_stopping_rounds": self.early_stopping_rounds}, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    # Early stopping needs an eval set, held out from the search folds and from the final fit
+    def _early_stopping_split(self, x_train, y_train):
+        return train_test_split(x_train, y_train, test_size=0.1, random_state=40, stratify=y_train)
+
+    # Final model for the chosen parameters; a tuning cache hit and a fresh search both end here,
+    # so the shipped model does not depend on the cache state
+    def _fit_final(self, best_params, x_train, y_train):
+        if self.search_mode == "grid":
+            best_xgb = xgb.XGBClassifier(objective='binary:logistic', n_jobs=os.cpu_count(), **best_params)
+            best_xgb.fit(x_train, y_train)
+        else:
+            x_fit, x_val, y_fit, y_val = self._early_stopping_split(x_train, y_train)
+            best_xgb = xgb.XGBClassifier(objective='binary:logistic', n_jobs=os.cpu_count(),
+                                         early_stopping_rounds=self.early_stopping_rounds, **best_params)
+            best_xgb.fit(x_fit, y_fit, eval_set=[(x_val, y_val)], verbose=False)
+        return best_xgb
+
     def hyperparameter_tuning(self, x_train, y_train):
         try:
             params = {
@@ -72,12 +120,39 @@ class ModelTraining:
                 'max_depth':[3,5,7],
                 'learning_rate':[0.01,0.1,0.2]
             }
-            xgb_model = xgb.XGBClassifier(objective='binary:logistic')
-            grid_search = GridSearchCV(estimator=xgb_model,param_grid=params, cv=5, scoring='accuracy',n_jobs=-1)
-            grid_search.fit(x_train, y_train)
 
-            logger.info(f"Best parameters : {grid_search.best_params_}")
-            return grid_search.best_estimator_
+            # Splitting the cores between sklearn's parallel fits and XGBoost's own threads avoids oversubscription
+            sklearn_jobs = max(1, (os.cpu_count() or 1) // self.xgb_threads)
+
+            cache_key = self._tuning_cache_key(x_train, y_train, params)
+            cache_file = os.path.join(self.tuning_cache_dir, f"{cache_key}.json")
+            if self.use_tuning_cache and os.path.exists(cache_file):
+                with open(cache_file) as f:
+                    best_params = json.load(f)
+                logger.info(f"Tuning cache hit, reusing parameters : {best_params}")
+                return self._fit_final(best_params, x_train, y_train)
+
+            if self.search_mode == "grid":
+                xgb_model = xgb.XGBClassifier(objective='binary:logistic', n_jobs=self.xgb_threads)
+                search = GridSearchCV(estimator=xgb_model,param_grid=params, cv=5, scoring='accuracy',n_jobs=sklearn_jobs,
+                                      refit=False)
+                search.fit(x_train, y_train)
+            else:
+                x_fit, x_val, y_fit, y_val = self._early_stopping_split(x_train, y_train)
+                xgb_model = xgb.XGBClassifier(objective='binary:logistic', n_jobs=self.xgb_threads,
+                                              early_stopping_rounds=self.early_stopping_rounds)
+                search = HalvingGridSearchCV(estimator=xgb_model, param_grid=params, cv=5, scoring='accuracy',
+                                             factor=3, n_jobs=sklearn_jobs, random_state=40, refit=False)
+                search.fit(x_fit, y_fit, eval_set=[(x_val, y_val)], verbose=False)
+
+            logger.info(f"Best parameters : {search.best_params_}")
+
+            if self.use_tuning_cache:
+                os.makedirs(self.tuning_cache_dir, exist_ok=True)
+                with open(cache_file, 'w') as f:
+                    json.dump(search.best_params_, f)
+
+            return self._fit_final(search.best_params_, x_train, y_train)
         except Exception as e:
             logger.error(f"Error in hyperparameter tuning {e}")
             raise CustomException(str(e))
@@ -89,13 +164,13 @@ class ModelTraining:
             accuracy = accuracy_score(y_test, y_pred)
             logger.info(f"Accuracy is {accuracy} ")
 
-            self.save_model(best_xgb)
+            self.save_model(best_xgb, metrics={"accuracy": accuracy}, data_hash=self.data_hash(x_train, y_train))
             return accuracy
         except Exception as e:
             logger.error(f"Error while model training {e}")
             raise CustomException(str(e))
         
-    def save_model(self, model):
+    def save_model(self, model, metrics=None, data_hash=""):
         try:
             model_filename = f"{self.model_save_path}xgb_classifier.pkl"
 
@@ -103,6 +178,11 @@ class ModelTraining:
                 pickle.dump(model, model_file)
 
             logger.info(f"Model saved at {model_filename}")
+
+            # Native booster + manifest, picked up by the serving app's ModelRegistry without a restart
+            version = publish_model(model, metrics or {}, data_hash, model_dir=self.model_save_path,
+                                    feature_names=list(model.get_booster().feature_names or FEATURE_NAMES))
+            logger.info(f"Model version {version} published")
         except Exception as e:
             logger.error(f"Error while saving the model {e}")
             raise CustomException(str(e))
@@ -113,6 +193,9 @@ class ModelTraining:
             x_train, x_test, y_train, y_test = self.prepare_data()
             accuracy = self.train_and_evaluate(x_train, y_train, x_test, y_test)
 
+            # Scaler parameters and drift reference sample for the serving app, over all customers
+            save_reference_stats(pd.concat([x_train, x_test]))
+
             logger.info("End of Model Training")
         except Exception as e:
             logger.info(f"Error while model training {e}")
@@ -0,0 +1,60 @@
+import os
+import json
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+from src.logger import get_logger
+from config.model_config import FEATURE_NAMES
+from config.paths_config import REFERENCE_DIR
+
+logger = get_logger(__name__)
+
+# Reference artifact : scaler parameters (json) + a downsampled, already scaled reference sample (.npy).
+# The sample is memory-mapped on load, so forked workers share the same pages instead of each
+# pulling every entity from Redis and fitting its own scaler.
+SCALER_FILE = "scaler.json"
+SAMPLE_FILE = "reference_sample.npy"
+
+
+def save_reference_stats(x_train, output_dir=REFERENCE_DIR, sample_size=5000, random_state=40):
+    os.makedirs(output_dir, exist_ok=True)
+    x = x_train[FEATURE_NAMES].to_numpy(dtype=np.float64)
+
+    scaler = StandardScaler().fit(x)
+    rng = np.random.default_rng(random_state)
+    if len(x) > sample_size:
+        x = x[rng.choice(len(x), size=sample_size, replace=False)]
+    sample = scaler.transform(x)
+
+    np.save(os.path.join(output_dir, SAMPLE_FILE), sample)
+    with open(os.path.join(output_dir, SCALER_FILE), 'w') as f:
+        json.dump({
+            "feature_names": FEATURE_NAMES,
+            "mean": scaler.mean_.tolist(),
+            "var": scaler.var_.tolist(),
+            "scale": scaler.scale_.tolist(),
+            "n_samples_seen": int(scaler.n_samples_seen_),
+            "sample_size": int(len(sample)),
+        }, f)
+    logger.info(f"Reference stats saved to {output_dir} ({len(sample)} sample rows)")
+
+
+def reference_stats_exist(input_dir=REFERENCE_DIR):
+    return os.path.exists(os.path.join(input_dir, SCALER_FILE)) and os.path.exists(os.path.join(input_dir, SAMPLE_FILE))
+
+
+def load_reference_stats(input_dir=REFERENCE_DIR):
+    with open(os.path.join(input_dir, SCALER_FILE)) as f:
+        stats = json.load(f)
+    if stats["feature_names"] != FEATURE_NAMES:
+        raise ValueError(f"Reference stats were saved for features {stats['feature_names']}, expected {FEATURE_NAMES}")
+
+    scaler = StandardScaler()
+    scaler.mean_ = np.array(stats["mean"])
+    scaler.var_ = np.array(stats["var"])
+    scaler.scale_ = np.array(stats["scale"])
+    scaler.n_samples_seen_ = stats["n_samples_seen"]
+    scaler.n_features_in_ = len(FEATURE_NAMES)
+
+    sample = np.load(os.path.join(input_dir, SAMPLE_FILE), mmap_mode='r')
+    logger.info(f"Reference stats loaded from {input_dir} ({len(sample)} sample rows)")
+    return scaler, sample
@@ -0,0 +1,88 @@
+"""
+Round-trip tests for the feature store codecs (no Redis needed).
+"""
+import json
+import struct
+
+import pytest
+
+from src.feature_codecs import (
+    CHURN_FEATURE_SCHEMA_V1, PACKED_TAG, HashCodec, JsonCodec, PackedCodec,
+    decode_result, decode_value, fallback_positions, get_codec
+)
+
+FEATURES = {
+    "CustomerId": 15634602,
+    "Surname": "Hargrave",
+    "CreditScore": 619.0,
+    "Gender": 0,
+    "Age": 42.0,
+    "Tenure": 2,
+    "Balance": 0.0,
+    "NumOfProducts": 1,
+    "HasCrCard": 1,
+    "IsActiveMember": 1,
+    "EstimatedSalary": 101348.88,
+    "Exited": 1,
+    "Geography_Germany": 0,
+    "Geography_Spain": 0,
+}
+
+
+def test_json_round_trip():
+    assert decode_value(JsonCodec().encode(FEATURES)) == FEATURES
+
+
+def test_legacy_json_string_is_readable():
+    # Values written before codecs existed are plain JSON text
+    assert decode_value(json.dumps(FEATURES)) == FEATURES
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    assert decode_value(get_codec("msgpack").encode(FEATURES)) == FEATURES
+
+
+def test_packed_round_trip_keeps_types_and_order():
+    decoded = decode_value(PackedCodec().encode(FEATURES))
+    assert decoded == FEATURES
+    assert list(decoded) == [name for name, _ in CHURN_FEATURE_SCHEMA_V1.fields]
+    assert isinstance(decoded["CustomerId"], int)
+    assert isinstance(decoded["Balance"], float)
+
+
+def test_packed_unknown_schema_version():
+    with pytest.raises(ValueError):
+        decode_value(PACKED_TAG + struct.pack("<H", 999))
+
+
+def test_hash_round_trip_from_raw_bytes():
+    # Redis hands hash fields back as bytes
+    mapping = {name.encode(): value.encode() for name, value in HashCodec().encode(FEATURES).items()}
+    assert HashCodec().decode(mapping) == FEATURES
+
+
+def test_decode_result_reads_every_codec():
+    hash_mapping = {name.encode(): value.encode() for name, value in HashCodec().encode(FEATURES).items()}
+    for result in (JsonCodec().encode(FEATURES), PackedCodec().encode(FEATURES), hash_mapping):
+        assert decode_result(result) == FEATURES
+
+
+@pytest.mark.parametrize("result", [None, b"", {}, RuntimeError("WRONGTYPE")])
+def test_decode_result_missing(result):
+    assert decode_result(result) is None
+
+
+def test_fallback_positions():
+    # MGET first : nil values may be hashes
+    assert fallback_positions([b"{}", None, {}, None], is_hash=False) == [1, 3]
+    # HGETALL first : WRONGTYPE errors are legacy string values, empty mappings are missing keys
+    assert fallback_positions([{b"a": b"1"}, RuntimeError("WRONGTYPE"), {}], is_hash=True) == [1]
+
+
+def test_get_codec():
+    assert get_codec("hash").is_hash
+    codec = JsonCodec()
+    assert get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        get_codec("pickle")
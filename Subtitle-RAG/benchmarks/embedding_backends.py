@@ -0,0 +1,157 @@
+"""
+Compare embedding backends: accuracy parity, latency and memory.
+
+Each backend is loaded in its own spawned process so peak RSS is measured in
+isolation. The PyTorch backend is the reference; the others must keep every
+sentence's cosine similarity to it above --min-cosine and return the same
+top-k neighbours, otherwise the script exits non-zero.
+
+    python -m benchmarks.embedding_backends
+    python -m benchmarks.embedding_backends --backends torch onnx onnx-int8 --threads 2
+"""
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import sys
+import time
+
+import numpy as np
+
+SAMPLE_LINES = [
+    "I'll be back.",
+    "May the Force be with you.",
+    "Here's looking at you, kid.",
+    "You can't handle the truth!",
+    "I'm going to make him an offer he can't refuse.",
+    "Houston, we have a problem.",
+    "Why so serious?",
+    "Keep your friends close, but your enemies closer.",
+    "There's no place like home.",
+    "I see dead people.",
+    "We're gonna need a bigger boat.",
+    "To infinity and beyond!",
+    "Get out of my house right now, before I call the police.",
+    "Where were you on the night of the murder?",
+    "The train leaves at seven, don't be late again.",
+    "I never wanted any of this to happen to us.",
+]
+
+BACKENDS = {
+    "torch": ("torch", False),
+    "onnx": ("onnx", False),
+    "onnx-int8": ("onnx", True),
+}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: list[float], q: float) -> float:
+    return float(np.percentile(values, q))
+
+
+def run_backend(name: str, threads: int, repeats: int, results: mp.Queue) -> None:
+    """Load one backend in a fresh process and report vectors, latency and memory."""
+    backend, quantize = BACKENDS[name]
+    if threads:
+        os.environ["EMBEDDING_ONNX_THREADS"] = str(threads)
+
+    import torch
+    if threads:
+        torch.set_num_threads(threads)
+
+    from src.embedding.embedder import load_embeddings_model
+
+    baseline_mb = peak_rss_mb()
+    start = time.perf_counter()
+    model = load_embeddings_model(backend, quantize)
+    load_seconds = time.perf_counter() - start
+
+    model.embed_documents(SAMPLE_LINES[:4])  # warm-up
+
+    query_ms = []
+    for _ in range(repeats):
+        for line in SAMPLE_LINES:
+            start = time.perf_counter()
+            model.embed_query(line)
+            query_ms.append((time.perf_counter() - start) * 1000)
+
+    batch_ms = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        vectors = model.embed_documents(SAMPLE_LINES)
+        batch_ms.append((time.perf_counter() - start) * 1000)
+
+    results.put({
+        "name": name,
+        "vectors": vectors,
+        "load_seconds": load_seconds,
+        "query_p50_ms": percentile(query_ms, 50),
+        "query_p95_ms": percentile(query_ms, 95),
+        "batch_mean_ms": statistics.mean(batch_ms),
+        "model_rss_mb": peak_rss_mb() - baseline_mb,
+        "peak_rss_mb": peak_rss_mb(),
+    })
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray, top_k: int) -> dict:
+    """Cosine similarity to the reference vectors and top-k neighbour agreement."""
+    # Both sides are L2-normalized, so dot products are cosine similarities
+    cosines = (reference * candidate).sum(axis=1)
+
+    ref_neighbours = np.argsort(-(reference @ reference.T), axis=1)[:, 1:top_k + 1]
+    cand_neighbours = np.argsort(-(candidate @ candidate.T), axis=1)[:, 1:top_k + 1]
+    overlap = [len(set(r) & set(c)) / top_k for r, c in zip(ref_neighbours, cand_neighbours)]
+
+    return {
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "topk_overlap": float(np.mean(overlap)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Embedding backend parity and performance benchmark")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = library default)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    args = parser.parse_args()
+
+    names = ["torch"] + [name for name in args.backends if name != "torch"]
+    ctx = mp.get_context("spawn")
+    reports = {}
+    for name in names:
+        results = ctx.Queue()
+        process = ctx.Process(target=run_backend, args=(name, args.threads, args.repeats, results))
+        process.start()
+        reports[name] = results.get()
+        process.join()
+
+    reference = np.asarray(reports["torch"]["vectors"])
+    failed = False
+
+    print(f"{'backend':<10} {'load s':>7} {'q p50 ms':>9} {'q p95 ms':>9} {'batch ms':>9} "
+          f"{'model MB':>9} {'min cos':>8} {'top-k':>6}")
+    for name in names:
+        report = reports[name]
+        check = parity(reference, np.asarray(report["vectors"]), args.top_k)
+        if name != "torch" and (check["min_cosine"] < args.min_cosine or check["topk_overlap"] < 1.0):
+            failed = True
+        print(f"{name:<10} {report['load_seconds']:>7.2f} {report['query_p50_ms']:>9.2f} "
+              f"{report['query_p95_ms']:>9.2f} {report['batch_mean_ms']:>9.2f} "
+              f"{report['model_rss_mb']:>9.0f} {check['min_cosine']:>8.4f} {check['topk_overlap']:>6.2f}")
+
+    if failed:
+        print(f"Parity check failed (min cosine < {args.min_cosine} or top-{args.top_k} neighbours differ)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Bounded thread-pool offload for CPU-heavy search calls.
+
+Embedding and the Chroma lookup are synchronous; running them directly inside
+``async def`` routes blocks the event loop. Calls are run on a dedicated
+executor instead, with at most SEARCH_MAX_CONCURRENCY running and
+SEARCH_QUEUE_SIZE waiting. Anything beyond that is rejected right away
+(HTTP 429), so probes and cheap endpoints stay responsive under load.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchOverloadedError(Exception):
+    """Raised when the search executor and its queue are full."""
+
+
+class SearchExecutor:
+    """Thread pool with admission control for search calls."""
+
+    def __init__(self, max_concurrency: int, queue_size: int):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="search")
+        # Only touched from the event loop thread, so no lock is needed
+        self.in_flight = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_concurrency + self.queue_size
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``func`` on the pool, or raise SearchOverloadedError when saturated."""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise SearchOverloadedError(
+                f"Search capacity exhausted ({self.max_concurrency} running, {self.queue_size} queued)"
+            )
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_search_executor: Optional[SearchExecutor] = None
+
+
+def get_search_executor() -> SearchExecutor:
+    """Get or create the search executor (singleton)."""
+    global _search_executor
+
+    if _search_executor is None:
+        settings = get_settings()
+        _search_executor = SearchExecutor(settings.SEARCH_MAX_CONCURRENCY, settings.SEARCH_QUEUE_SIZE)
+        logger.info(
+            f"Search executor: {settings.SEARCH_MAX_CONCURRENCY} workers, queue of {settings.SEARCH_QUEUE_SIZE}"
+        )
+
+    return _search_executor
+
+
+def reset_search_executor(max_concurrency: Optional[int] = None, queue_size: Optional[int] = None) -> Optional[SearchExecutor]:
+    """
+    Shut down the current executor.
+
+    With both sizes given a new executor is installed (e.g. in tests); otherwise
+    the next get_search_executor() call recreates one from settings.
+    """
+    global _search_executor
+
+    if _search_executor is not None:
+        _search_executor.shutdown()
+        _search_executor = None
+
+    if max_concurrency is not None and queue_size is not None:
+        _search_executor = SearchExecutor(max_concurrency, queue_size)
+    return _search_executor
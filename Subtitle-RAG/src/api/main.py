@@ -13,8 +13,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.routes import router
 from src.config import get_settings
-from src.retrieval.search import get_chroma_db
-from src.embedding.embedder import get_embeddings_model
+from src.api.concurrency import reset_search_executor
+from src.api.readiness import get_readiness
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,22 +24,21 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan handler. Preloads models on startup."""
-    logger.info("Starting SubtitleRAG....")
-
-    logger.info("Loading embedding model....")
-    get_embeddings_model()
+    """
+    Application lifespan handler.
 
-    logger.info("Connecting to ChromaDB...")
-    db = get_chroma_db()
-    doc_count = db._collection.count() 
-    logger.info(f"ChromaDB ready with {doc_count} documents")
+    Models are preloaded in the background: the server accepts connections
+    (and answers /live) right away, /ready turns 200 once warm-up finishes.
+    """
+    logger.info("Starting SubtitleRAG....")
 
-    logger.info("Subtitle RAG ready")
+    logger.info("Warming up embedding model and ChromaDB in the background....")
+    get_readiness().start()
 
     yield
 
     logger.info("Shutting down SubtitleRAG....")
+    reset_search_executor()
 
 
 def create_app() -> FastAPI:
@@ -60,6 +59,7 @@ def create_app() -> FastAPI:
         - `POST /query` - Search with full options
         - `GET /search` - Simple search
         - `GET /health` - Health check
+        - `GET /ready` - Readiness (503 until warm-up finishes)
         - `GET /stats` - Collection statistics
         """,
         version = "1.0.0",
@@ -0,0 +1,91 @@
+"""
+Startup warm-up and readiness state.
+
+The lifespan hook starts the warm-up (embedding model, ChromaDB, one query
+embedding) in a background thread and returns immediately, so the process
+answers /live within moments of starting. /ready reports 503 until the
+warm-up has finished, which is what Kubernetes uses to route traffic. A
+failed warm-up is retried rather than leaving the pod alive but never ready.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from src.embedding.embedder import embed_query, get_embeddings_model
+from src.retrieval.search import get_chroma_db
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessState:
+    """Tracks the warm-up steps, their durations and any failure."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready = False
+        self.error: Optional[str] = None
+        self.steps: dict[str, float] = {}
+        self.startup_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _step(self, name: str, func) -> None:
+        start = time.perf_counter()
+        func()
+        self.steps[name] = round(time.perf_counter() - start, 3)
+        logger.info(f"Warm-up step '{name}' took {self.steps[name]:.2f}s")
+
+    def warm_up(self) -> None:
+        """Load everything a search needs; safe to call more than once."""
+        with self._lock:
+            if self.ready:
+                return
+            try:
+                self._step("embedding_model", get_embeddings_model)
+                self._step("chroma", lambda: get_chroma_db()._collection.count())
+                self._step("first_query", lambda: embed_query("warm up"))
+            except Exception as e:
+                self.error = str(e)
+                logger.error(f"Warm-up failed: {e}")
+                return
+
+            self.error = None
+            self.startup_seconds = round(time.perf_counter() - self.started_at, 3)
+            self.ready = True
+            logger.info(f"Subtitle RAG ready in {self.startup_seconds:.2f}s")
+
+    def start(self, retry_interval: float = 10.0) -> None:
+        """Run warm_up in a daemon thread, retrying every retry_interval seconds until ready."""
+        def run():
+            while True:
+                self.warm_up()
+                if self.ready:
+                    return
+                time.sleep(retry_interval)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=run, name="warm-up", daemon=True)
+            self._thread.start()
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else ("failed" if self.error else "starting"),
+            "ready": self.ready,
+            "startup_seconds": self.startup_seconds,
+            "steps": dict(self.steps),
+            "error": self.error,
+        }
+
+
+_readiness: Optional[ReadinessState] = None
+
+
+def get_readiness() -> ReadinessState:
+    """Get or create the process readiness state (singleton)."""
+    global _readiness
+
+    if _readiness is None:
+        _readiness = ReadinessState()
+
+    return _readiness
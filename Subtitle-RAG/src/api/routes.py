@@ -6,14 +6,19 @@ import time
 import logging
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from src.api.schemas import (
     QueryRequest, QueryResponse, SearchResult,
-    HealthResponse, StatsResponse, ErrorResponse
+    HealthResponse, ReadinessResponse, StatsResponse, ErrorResponse
 )
 
 from src.retrieval.search import search_similar, get_collection_stats, get_chroma_db
-from src.embedding import embed_query, get_embedding_dimension
+from src.retrieval.cache import get_cache_stats
+from src.api.concurrency import get_search_executor, SearchOverloadedError
+from src.api.readiness import get_readiness
+from src.embedding.embedder import get_embedding_batcher
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -21,11 +26,11 @@ router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
-    """Health check endpoint for Kubernetes liveness/readiness probes."""
+    """Deep health check: queries ChromaDB (use /live and /ready for probes)."""
     settings = get_settings()
 
     try:
-        stats = get_collection_stats()
+        stats = await run_in_threadpool(get_collection_stats)
         chroma_connected = True
         doc_count = stats["total_documents"]
     except Exception as e:
@@ -46,7 +51,14 @@ async def liveness_check():
     return {"status": "alive"}
 
 
-@router.post("/query", response_model=QueryResponse, responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}}, tags=["Search"])
+@router.get("/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}}, tags=["Health"])
+async def readiness_check():
+    """Readiness probe - 503 until the embedding model and ChromaDB are warmed up."""
+    status = get_readiness().status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+@router.post("/query", response_model=QueryResponse, responses={400: {"model": ErrorResponse}, 429: {"model": ErrorResponse}, 500: {"model": ErrorResponse}}, tags=["Search"])
 async def search_subtitles(request: QueryRequest):
         """
     Search for subtitles matching the query.
@@ -58,7 +70,9 @@ async def search_subtitles(request: QueryRequest):
         start_time = time.time()
 
         try:
-             results = search_similar(
+             # Embedding + Chroma lookup run on the bounded search pool, not on the event loop
+             results = await get_search_executor().run(
+                  search_similar,
                   query=request.query,
                   top_k=request.top_k,
                   score_threshold=request.score_threshold
@@ -80,6 +94,10 @@ async def search_subtitles(request: QueryRequest):
                   total_results=len(search_results)
              )
         
+        except SearchOverloadedError as e:
+             logger.warning(f"Search rejected: {e}")
+             raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
         except Exception as e:
              logger.error(f"Search failed: {e}")
              raise HTTPException(status_code=500, detail=str(e))
@@ -98,8 +116,9 @@ async def search_subtitles_get(
 async def get_stats():
      """Get collection statistics."""
      try:
-          stats = get_collection_stats()
-          return StatsResponse(**stats)
+          stats = await run_in_threadpool(get_collection_stats)
+          return StatsResponse(**stats, cache=get_cache_stats(), search_executor=get_search_executor().stats(),
+                                embedding_batcher=get_embedding_batcher().stats())
      except Exception as e:
           logger.error(f"Stats retrieval failed: {e}")
           raise HTTPException(status_code=500, detail=str(e))
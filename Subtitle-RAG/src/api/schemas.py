@@ -36,11 +36,23 @@ class HealthResponse(BaseModel):
     embedding_model: str = Field(..., description="Embedding model name")
 
 
+class ReadinessResponse(BaseModel):
+    """Response schema for the readiness probe."""
+    status: str = Field(..., description="starting, ready or failed")
+    ready: bool = Field(..., description="Whether the service can take search traffic")
+    startup_seconds: Optional[float] = Field(default=None, description="Time from application startup to ready")
+    steps: dict = Field(default_factory=dict, description="Duration of each warm-up step in seconds")
+    error: Optional[str] = Field(default=None, description="Warm-up failure, if any")
+
+
 class StatsResponse(BaseModel):
     """Response schema for collection statistics."""
     total_documents: int
     collection_name: str
     persist_directory: str
+    cache: Optional[dict] = Field(default=None, description="Query embedding and result cache statistics")
+    search_executor: Optional[dict] = Field(default=None, description="Search pool concurrency and rejection statistics")
+    embedding_batcher: Optional[dict] = Field(default=None, description="Query micro-batching statistics")
 
 
 class ErrorResponse(BaseModel):
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
 
     # Emmbedding Model
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2")
+    # "torch" (sentence-transformers) or "onnx" (ONNX Runtime, optionally int8-quantized)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch")
+    EMBEDDING_QUANTIZE: bool = os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true"
+    EMBEDDING_ONNX_DIR: str = os.getenv("EMBEDDING_ONNX_DIR", "./onnx_models")
+    EMBEDDING_ONNX_THREADS: int = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
 
     # API Settings
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -23,6 +28,21 @@ class Settings(BaseSettings):
     #Search Defaults
     DEFAULT_TOP_K: int = int(os.getenv("DEFAULT_TOP_K", "5"))
 
+    # Query Caches (size 0 disables a cache, TTL 0 means no expiry)
+    QUERY_CACHE_SIZE: int = int(os.getenv("QUERY_CACHE_SIZE", "10000"))
+    QUERY_CACHE_TTL: float = float(os.getenv("QUERY_CACHE_TTL", "0"))
+    RESULT_CACHE_SIZE: int = int(os.getenv("RESULT_CACHE_SIZE", "2000"))
+    RESULT_CACHE_TTL: float = float(os.getenv("RESULT_CACHE_TTL", "3600"))
+
+    # Search Concurrency (requests beyond running + queued get HTTP 429)
+    SEARCH_MAX_CONCURRENCY: int = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+    SEARCH_QUEUE_SIZE: int = int(os.getenv("SEARCH_QUEUE_SIZE", "32"))
+
+    # Query Micro-batching (concurrent queries are encoded together)
+    EMBED_BATCHING_ENABLED: bool = os.getenv("EMBED_BATCHING_ENABLED", "true").lower() == "true"
+    EMBED_BATCH_WINDOW_MS: float = float(os.getenv("EMBED_BATCH_WINDOW_MS", "5"))
+    EMBED_MAX_BATCH_SIZE: int = int(os.getenv("EMBED_MAX_BATCH_SIZE", "32"))
+
     # LangSmith
     LANGCHAIN_TRACING_V2: str = os.getenv("LANGCHAIN_TRACING_V2", "FALSE")
     LANGCHAIN_API_KEY: str = os.getenv("LANGCHAIN_API_KEY", "")
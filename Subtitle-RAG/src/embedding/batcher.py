@@ -0,0 +1,93 @@
+"""
+Dynamic micro-batching of concurrent query embeddings.
+
+Searches run on several worker threads at once. Instead of each thread
+running its own single-sentence forward pass, queries are queued and a
+background thread encodes everything that arrives within a short window
+(or until the batch is full) in one ``embed_documents`` call, then hands each
+vector back to its waiting caller.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Collects concurrent texts for up to ``window_ms`` or ``max_batch_size`` items and encodes them together."""
+
+    def __init__(self, encode_batch: Callable[[list[str]], list[list[float]]], window_ms: float, max_batch_size: int):
+        self.encode_batch = encode_batch
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[tuple[str, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, text: str) -> Future:
+        """Queue a text; the returned future resolves to its embedding."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> list[float]:
+        """Blocking helper: submit and wait for the embedding."""
+        return self.submit(text).result()
+
+    def _ensure_started(self) -> None:
+        # Started lazily, and again after a fork (threads do not survive fork)
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+            self._thread.start()
+
+    def _collect(self) -> list[tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # Identical texts in one batch are encoded once
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = dict(zip(unique_texts, self.encode_batch(unique_texts)))
+            except Exception as e:
+                logger.error(f"Batch embedding of {len(unique_texts)} texts failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for text, future in batch:
+                future.set_result(vectors[text])
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -1,40 +1,121 @@
 """
 Embedding utilities using HuggingFace models.
+
+EMBEDDING_BACKEND selects full-precision PyTorch (sentence-transformers) or
+ONNX Runtime (src.embedding.onnx_backend); both expose the LangChain
+Embeddings interface, so Chroma and the helpers below work with either.
+
+The model stacks (langchain, sentence-transformers, torch, onnxruntime) are
+imported when a model is loaded, not when this module is imported, so the
+API process starts without paying for them.
 """
+import json
 import logging
-from typing import Optional
-
-from langchain_huggingface import HuggingFaceEmbeddings
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 from src.config import get_settings
+from src.retrieval.cache import get_embedding_cache, normalize_query
+from src.embedding.batcher import EmbeddingBatcher
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
 
 logger = logging.getLogger(__name__)
 
-_embeddings_model: Optional[HuggingFaceEmbeddings] = None
+_embeddings_model: Optional["Embeddings"] = None
+_batcher: Optional[EmbeddingBatcher] = None
+# Warm-up and early requests can race to create the singletons; only one of them loads
+_model_lock = threading.Lock()
+_batcher_lock = threading.Lock()
 
-def get_embeddings_model() -> HuggingFaceEmbeddings:
-    """Get or create the embeddings model (singleton)."""
-    global _embeddings_model
+def load_embeddings_model(backend: str, quantize: bool = False) -> "Embeddings":
+    """Load a new embeddings model for the given backend ("torch" or "onnx")."""
+    settings = get_settings()
 
-    if _embeddings_model is None:
-        settings = get_settings()
-        logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL}")
+    if backend == "onnx":
+        from src.embedding.onnx_backend import OnnxEmbeddings
+
+        return OnnxEmbeddings(
+            model_name=settings.EMBEDDING_MODEL,
+            cache_dir=settings.EMBEDDING_ONNX_DIR,
+            quantize=quantize,
+            intra_op_threads=settings.EMBEDDING_ONNX_THREADS
+        )
+    if backend == "torch":
+        from langchain_huggingface import HuggingFaceEmbeddings
 
-        _embeddings_model = HuggingFaceEmbeddings(
+        return HuggingFaceEmbeddings(
             model_name = settings.EMBEDDING_MODEL,
             model_kwargs = {'device' : 'cpu'},
             encode_kwargs = {'normalize_embeddings' : True}
         )
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend!r} (expected 'torch' or 'onnx')")
+
+
+def get_embeddings_model() -> "Embeddings":
+    """Get or create the embeddings model (singleton)."""
+    global _embeddings_model
+
+    if _embeddings_model is None:
+        with _model_lock:
+            if _embeddings_model is None:
+                settings = get_settings()
+                quantized = " (int8)" if settings.EMBEDDING_BACKEND == "onnx" and settings.EMBEDDING_QUANTIZE else ""
+                logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL} [{settings.EMBEDDING_BACKEND}{quantized}]")
 
-        logger.info("Encoding model loaded successfully")
+                _embeddings_model = load_embeddings_model(settings.EMBEDDING_BACKEND, settings.EMBEDDING_QUANTIZE)
+
+                logger.info("Encoding model loaded successfully")
 
     return _embeddings_model
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get or create the query micro-batcher (singleton)."""
+    global _batcher
+
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                settings = get_settings()
+                _batcher = EmbeddingBatcher(
+                    encode_batch=lambda texts: get_embeddings_model().embed_documents(texts),
+                    window_ms=settings.EMBED_BATCH_WINDOW_MS,
+                    max_batch_size=settings.EMBED_MAX_BATCH_SIZE
+                )
+                logger.info(
+                    f"Query micro-batching enabled: window {settings.EMBED_BATCH_WINDOW_MS}ms, "
+                    f"max batch {settings.EMBED_MAX_BATCH_SIZE}"
+                )
+
+    return _batcher
     
 
 def embed_query(query: str) -> list[float]:
-    """Embed a single query string."""
-    model = get_embeddings_model()
-    return model.embed_query(query)
+    """
+    Embed a single query string.
+
+    Embeddings are cached by (model, backend, normalized query), so repeated
+    queries skip the transformer forward pass. Only the cache key is
+    normalized; the model always sees the original text. Cache misses from
+    concurrent requests are encoded together by the micro-batcher.
+    """
+    settings = get_settings()
+    normalized = normalize_query(query)
+    cache = get_embedding_cache()
+    cache_key = (settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_QUANTIZE, normalized)
+
+    embedding = cache.get(cache_key)
+    if embedding is None:
+        if settings.EMBED_BATCHING_ENABLED:
+            embedding = get_embedding_batcher().embed(query)
+        else:
+            embedding = get_embeddings_model().embed_query(query)
+        cache.set(cache_key, embedding)
+    return embedding
 
 
 def embed_documents(texts: list[str]) -> list[list[float]]:
@@ -44,11 +125,29 @@ def embed_documents(texts: list[str]) -> list[list[float]]:
     return model.embed_documents(texts)
 
 
-def get_embedding_dimension() -> int:
-    """Get the dimension of the embedding vectors."""
-    model = get_embeddings_model()
-    test_embedding = model.embed_query("test")
-    return len(test_embedding)
+def _read_model_config(model_name: str) -> dict:
+    """config.json of a local model directory or of a (cached) Hugging Face Hub model."""
+    local_path = Path(model_name) / "config.json"
+    if local_path.exists():
+        return json.loads(local_path.read_text())
 
-                
+    from huggingface_hub import hf_hub_download, try_to_load_from_cache
 
+    cached = try_to_load_from_cache(model_name, "config.json")
+    path = cached if isinstance(cached, str) else hf_hub_download(model_name, "config.json")
+    return json.loads(Path(path).read_text())
+
+
+@lru_cache
+def get_embedding_dimension() -> int:
+    """
+    Get the dimension of the embedding vectors.
+
+    Read from the model's config.json (hidden size; the pooling layer keeps it)
+    instead of running a forward pass, so it works before the model is loaded.
+    """
+    config = _read_model_config(get_settings().EMBEDDING_MODEL)
+    for key in ("hidden_size", "d_model", "dim"):
+        if key in config:
+            return int(config[key])
+    raise ValueError(f"No embedding dimension in the config of {get_settings().EMBEDDING_MODEL}")
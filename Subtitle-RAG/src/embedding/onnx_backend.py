@@ -0,0 +1,170 @@
+"""
+ONNX Runtime CPU backend for the sentence-transformer embedding model.
+
+The transformer is exported to ONNX once (optionally int8 dynamic-quantized)
+and cached on disk. Inference runs on an onnxruntime session with a fixed
+intra-op thread count; mean pooling and L2 normalization are done in numpy,
+matching what sentence-transformers does for all-mpnet-base-v2.
+
+Export ahead of time (e.g. in the Docker build) with:
+    python -m src.embedding.onnx_backend --quantize
+"""
+import argparse
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model_int8.onnx"
+
+
+def model_dir(model_name: str, cache_dir: str) -> Path:
+    """Export directory of a model, e.g. <cache_dir>/sentence-transformers__all-mpnet-base-v2."""
+    return Path(cache_dir) / model_name.replace("/", "__")
+
+
+def export_onnx_model(model_name: str, cache_dir: str, quantize: bool = False) -> Path:
+    """
+    Export the transformer and tokenizer to ONNX (no-op when already exported).
+
+    Returns the path of the ONNX file to load: the int8 one when quantize is set.
+    """
+    output_dir = model_dir(model_name, cache_dir)
+    fp32_path = output_dir / FP32_FILE
+    int8_path = output_dir / INT8_FILE
+
+    if not fp32_path.exists():
+        # torch / transformers are only needed for the one-off export
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        logger.info(f"Exporting {model_name} to ONNX in {output_dir}")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Written under a per-process name and renamed, so concurrent exports never leave a half-written file
+        tmp_fp32_path = output_dir / f"{FP32_FILE}.{os.getpid()}.tmp"
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).eval()
+        tokenizer.save_pretrained(output_dir)
+
+        sample = tokenizer(["an example subtitle line"], return_tensors="pt")
+        input_names = list(sample.keys())
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                tuple(sample[name] for name in input_names),
+                str(tmp_fp32_path),
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                do_constant_folding=True
+            )
+        os.replace(tmp_fp32_path, fp32_path)
+        logger.info(f"ONNX model written to {fp32_path}")
+
+    if not quantize:
+        return fp32_path
+
+    if not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {fp32_path.name} to int8")
+        tmp_int8_path = output_dir / f"{INT8_FILE}.{os.getpid()}.tmp"
+        quantize_dynamic(str(fp32_path), str(tmp_int8_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_int8_path, int8_path)
+        logger.info(f"Quantized model written to {int8_path}")
+
+    return int8_path
+
+
+class OnnxEmbeddings(Embeddings):
+    """LangChain Embeddings backed by an onnxruntime session (mean pooling + L2 norm)."""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        quantize: bool = False,
+        intra_op_threads: int = 0,
+        max_seq_length: int = 384,
+        batch_size: int = 32
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.max_seq_length = max_seq_length
+        self.batch_size = batch_size
+
+        model_path = export_onnx_model(model_name, cache_dir, quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path.parent)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # 0 lets onnxruntime use one thread per physical core
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+        logger.info(
+            f"ONNX Runtime session ready: {model_path.name}, "
+            f"intra-op threads {intra_op_threads or 'auto'}"
+        )
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        inputs = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        # Sort by length so each batch pads to a similar sequence length
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: list[Optional[list[float]]] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            for i, vector in zip(idx, self._encode([texts[i] for i in idx])):
+                vectors[i] = vector.tolist()
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._encode([text])[0].tolist()
+
+
+if __name__ == "__main__":
+    from src.config import get_settings
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--cache-dir", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--quantize", action="store_true", help="Also write the int8 dynamic-quantized model")
+    args = parser.parse_args()
+
+    print(export_onnx_model(args.model, args.cache_dir, args.quantize))
@@ -0,0 +1,112 @@
+"""
+In-process LRU/TTL caches for query embeddings and search results.
+"""
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text for cache keys.
+
+    Unicode is NFKC-normalized and whitespace is collapsed, so "I'll be back"
+    and "  I'll  be back " share one entry. Case is kept: not every embedding
+    model lowercases its input.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL and hit/miss counters."""
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert a value, evicting the least recently used entries beyond max_size."""
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss statistics for the /stats endpoint."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_embedding_cache: Optional[LRUCache] = None
+_result_cache: Optional[LRUCache] = None
+
+
+def get_embedding_cache() -> LRUCache:
+    """Get or create the query embedding cache (singleton)."""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        from src.config import get_settings
+        settings = get_settings()
+        _embedding_cache = LRUCache(settings.QUERY_CACHE_SIZE, settings.QUERY_CACHE_TTL or None)
+
+    return _embedding_cache
+
+
+def get_result_cache() -> LRUCache:
+    """Get or create the search result cache (singleton). Size 0 disables it."""
+    global _result_cache
+
+    if _result_cache is None:
+        from src.config import get_settings
+        settings = get_settings()
+        _result_cache = LRUCache(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL or None)
+
+    return _result_cache
+
+
+def get_cache_stats() -> dict:
+    """Statistics of both caches."""
+    return {
+        "query_embeddings": get_embedding_cache().stats(),
+        "search_results": get_result_cache().stats(),
+    }
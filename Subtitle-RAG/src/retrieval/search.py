@@ -2,36 +2,63 @@
 Search and retrieval utilities using ChromaDB.
 """
 
+import functools
 import logging
-from typing import Optional
-
-from langchain_chroma import Chroma
-from langchain_core.documents import Document
-from langsmith import traceable
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from src.config import get_settings
-from src.embedding.embedder import get_embeddings_model
+from src.embedding.embedder import get_embeddings_model, embed_query
+from src.retrieval.cache import get_result_cache, normalize_query
+
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_core.documents import Document
 
 logger = logging.getLogger(__name__)
 
-_chroma_db: Optional[Chroma] = None
+_chroma_db: Optional["Chroma"] = None
+# Warm-up and early requests can race to open ChromaDB; only one of them does
+_chroma_lock = threading.Lock()
+
+
+def traceable(**trace_kwargs):
+    """langsmith.traceable, applied on the first call so langsmith is not imported at startup."""
+    def decorator(func):
+        traced = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal traced
+            if traced is None:
+                from langsmith import traceable as langsmith_traceable
+                traced = langsmith_traceable(**trace_kwargs)(func)
+            return traced(*args, **kwargs)
+        return wrapper
+    return decorator
 
-def get_chroma_db() -> Chroma:
+
+def get_chroma_db() -> "Chroma":
     """Get or create the ChromaDB instance (singleton)."""
     global _chroma_db
 
     if _chroma_db is None:
-        settings = get_settings()
-        logger.info(f"Loading ChromaDB from : {settings.CHROMA_PERSIST_DIR}")
-
-        _chroma_db = Chroma(
-            collection_name=settings.CHROMA_COLLECTION_NAME,
-            embedding_function=get_embeddings_model(),
-            persist_directory=settings.CHROMA_PERSIST_DIR
-        )
-
-        doc_count = _chroma_db._collection.count()
-        logger.info(f"ChromaDB loaded with {doc_count} documents")
+        with _chroma_lock:
+            if _chroma_db is None:
+                from langchain_chroma import Chroma
+
+                settings = get_settings()
+                logger.info(f"Loading ChromaDB from : {settings.CHROMA_PERSIST_DIR}")
+
+                db = Chroma(
+                    collection_name=settings.CHROMA_COLLECTION_NAME,
+                    embedding_function=get_embeddings_model(),
+                    persist_directory=settings.CHROMA_PERSIST_DIR
+                )
+
+                doc_count = db._collection.count()
+                logger.info(f"ChromaDB loaded with {doc_count} documents")
+                _chroma_db = db
     
     return _chroma_db
 
@@ -51,8 +78,17 @@ def search_similar(query: str, top_k: Optional[int] = None, score_threshold: Opt
         settings = get_settings()
         top_k = top_k or settings.DEFAULT_TOP_K
 
+        result_cache = get_result_cache()
+        cache_key = (settings.EMBEDDING_MODEL, normalize_query(query), top_k, score_threshold)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+             logger.info(f"Query: '{query[:50]}...' served from result cache")
+             return list(cached)
+
+        # Embedding goes through the query embedding cache, Chroma only runs the vector lookup
+        embedding = embed_query(query)
         db = get_chroma_db()
-        results = db.similarity_search_with_score(query, k=top_k)
+        results = db.similarity_search_by_vector_with_relevance_scores(embedding, k=top_k)
 
         formatted_results = []
         for doc, score in results:
@@ -68,7 +104,8 @@ def search_similar(query: str, top_k: Optional[int] = None, score_threshold: Opt
              })
         
         logger.info(f"Query: '{query[:50]}...' returned {len(formatted_results)} results")
-        return formatted_results
+        result_cache.set(cache_key, formatted_results)
+        return list(formatted_results)
 
 
 @traceable(run_type="retriever", name="vector_search")
@@ -94,7 +131,7 @@ def get_collection_stats() -> dict:
      }
 
 
-def add_documents(documents: list[Document], batch_size: Optional[int] = None) -> int:
+def add_documents(documents: list["Document"], batch_size: Optional[int] = None) -> int:
      """Add documents to ChromaDB in batches."""
      settings = get_settings()
      batch_size = batch_size or settings.BATCH_SIZE
@@ -108,6 +145,8 @@ def add_documents(documents: list[Document], batch_size: Optional[int] = None) -
           total_added += len(batch)
           logger.info(f"Added batch {i // batch_size + 1}: {total_added}/{len(documents)}")
 
+     # Cached result lists predate the new documents
+     get_result_cache().clear()
      return total_added
     
 
@@ -56,4 +56,125 @@ class TestSchemas:
             QueryRequest(query="", top_k=5)  # Empty query
 
         with pytest.raises(ValidationError):
-            QueryRequest(query="test", top_k=100)  # top_k > 50
\ No newline at end of file
+            QueryRequest(query="test", top_k=100)  # top_k > 50
+
+class TestQueryCache:
+    """Test the query embedding / result cache."""
+
+    def test_normalize_query(self):
+        """Test that whitespace and Unicode variants share one key, casing variants don't."""
+        from src.retrieval.cache import normalize_query
+
+        assert normalize_query("  I'll   be\tback ") == normalize_query("I'll be back")
+        assert normalize_query("ｆｉｎｅ") == normalize_query("fine")
+        assert normalize_query("I'll BE back") != normalize_query("i'll be back")
+
+    def test_lru_eviction_and_stats(self):
+        """Test LRU eviction order and hit/miss counters."""
+        from src.retrieval.cache import LRUCache
+
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "a" is now most recently used
+        cache.set("c", 3)  # evicts "b"
+
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test that entries expire after the TTL."""
+        import src.retrieval.cache as cache_module
+
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = cache_module.LRUCache(max_size=10, ttl=5)
+        cache.set("q", [0.1, 0.2])
+
+        assert cache.get("q") == [0.1, 0.2]
+        now[0] += 6
+        assert cache.get("q") is None
+
+    def test_model_sees_original_query(self, monkeypatch):
+        """Test that only the cache key is normalized, not the text sent to the model."""
+        from src.config import get_settings
+        from src.embedding import embedder
+        from src.retrieval.cache import get_embedding_cache
+
+        seen = []
+
+        class FakeModel:
+            def embed_query(self, text):
+                seen.append(text)
+                return [1.0]
+
+        monkeypatch.setattr(get_settings(), "EMBED_BATCHING_ENABLED", False)
+        monkeypatch.setattr(embedder, "get_embeddings_model", lambda: FakeModel())
+        get_embedding_cache().clear()
+
+        embedder.embed_query("  I'll BE Back ")
+        embedder.embed_query("I'll BE Back")
+        embedder.embed_query("i'll be back")
+
+        assert seen == ["  I'll BE Back ", "i'll be back"]
+        get_embedding_cache().clear()
+
+
+class TestEmbeddingBatcher:
+    """Test micro-batching of concurrent query embeddings."""
+
+    def test_concurrent_queries_share_batches(self):
+        """Test that concurrent submissions are encoded in fewer calls and fanned out correctly."""
+        import threading
+        import time
+        from src.embedding.batcher import EmbeddingBatcher
+
+        calls = []
+
+        def encode_batch(texts):
+            calls.append(list(texts))
+            time.sleep(0.01)
+            return [[float(len(text))] for text in texts]
+
+        batcher = EmbeddingBatcher(encode_batch, window_ms=20, max_batch_size=16)
+        texts = [f"query {'x' * i}" for i in range(12)]
+        results = {}
+
+        def worker(text):
+            results[text] = batcher.embed(text)
+
+        threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(results[text] == [float(len(text))] for text in texts)
+        assert len(calls) < len(texts)
+        assert batcher.stats()["items"] == len(texts)
+
+
+class TestOnnxBackend:
+    """Test accuracy parity of the ONNX Runtime embedding backend."""
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_onnx_matches_torch_embeddings(self, quantize, tmp_path, monkeypatch):
+        """Test that ONNX (fp32 and int8) embeddings stay close to the PyTorch reference."""
+        pytest.importorskip("onnxruntime")
+        import numpy as np
+        from src.config import get_settings
+        from src.embedding.embedder import load_embeddings_model
+
+        monkeypatch.setattr(get_settings(), "EMBEDDING_ONNX_DIR", str(tmp_path))
+        texts = ["I'll be back.", "May the Force be with you.", "Houston, we have a problem."]
+
+        reference = np.asarray(load_embeddings_model("torch").embed_documents(texts))
+        candidate = np.asarray(load_embeddings_model("onnx", quantize).embed_documents(texts))
+
+        cosines = (reference * candidate).sum(axis=1)
+        assert candidate.shape == reference.shape
+        assert cosines.min() > (0.98 if quantize else 0.9999)
@@ -0,0 +1,81 @@
+"""
+Load tests for the search concurrency limits.
+
+The search itself is replaced by a blocking stub (time.sleep), so these tests
+measure how the API behaves when every search slot is busy, without loading
+the embedding model or ChromaDB.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+SEARCH_SECONDS = 0.2
+MAX_CONCURRENCY = 2
+QUEUE_SIZE = 2
+
+
+def slow_search(query, top_k=None, score_threshold=None):
+    """Blocking stand-in for search_similar."""
+    time.sleep(SEARCH_SECONDS)
+    return [{"content": query, "metadata": {}, "similarity_score": 1.0}]
+
+
+@pytest.fixture
+def app(monkeypatch):
+    from src.api import routes
+    from src.api.concurrency import reset_search_executor
+    from src.api.main import app
+
+    monkeypatch.setattr(routes, "search_similar", slow_search)
+    reset_search_executor(MAX_CONCURRENCY, QUEUE_SIZE)
+    yield app
+    reset_search_executor()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_throughput_and_probe_latency(app):
+    """Searches run in parallel on the pool and /live stays fast while it is saturated."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        searches = [
+            asyncio.create_task(client.post("/api/v1/query", json={"query": f"q{i}"}))
+            for i in range(MAX_CONCURRENCY + QUEUE_SIZE)
+        ]
+        await asyncio.sleep(0.05)  # let the searches occupy every slot
+
+        probe_start = time.perf_counter()
+        live = await client.get("/api/v1/live")
+        probe_latency = time.perf_counter() - probe_start
+
+        responses = await asyncio.gather(*searches)
+        elapsed = time.perf_counter() - start
+
+    throughput = len(responses) / elapsed
+    print(f"\n{len(responses)} searches in {elapsed:.2f}s ({throughput:.1f} req/s), /live took {probe_latency * 1000:.1f}ms")
+
+    assert all(r.status_code == 200 for r in responses)
+    assert live.status_code == 200
+    # The event loop is free : the probe does not wait for a search to finish
+    assert probe_latency < SEARCH_SECONDS / 2
+    # Two workers : four searches take two rounds, not four sequential ones
+    assert elapsed < SEARCH_SECONDS * (MAX_CONCURRENCY + QUEUE_SIZE) * 0.75
+
+
+@pytest.mark.asyncio
+async def test_backpressure_returns_429(app):
+    """Requests beyond running + queued capacity are rejected with 429."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        total = (MAX_CONCURRENCY + QUEUE_SIZE) * 2
+        responses = await asyncio.gather(*[
+            client.post("/api/v1/query", json={"query": f"q{i}"}) for i in range(total)
+        ])
+
+    statuses = [r.status_code for r in responses]
+    assert statuses.count(200) == MAX_CONCURRENCY + QUEUE_SIZE
+    assert statuses.count(429) == total - (MAX_CONCURRENCY + QUEUE_SIZE)
+    rejected = next(r for r in responses if r.status_code == 429)
+    assert rejected.headers["retry-after"] == "1"
@@ -0,0 +1,133 @@
+"""
+Startup-time benchmark and readiness gate tests.
+
+Importing the API must not pull in the model stacks, /live must answer while
+the warm-up is still running, and /ready must only turn 200 once it is done.
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_SECONDS = 5.0
+HEAVY_MODULES = [
+    "torch", "sentence_transformers", "transformers", "onnxruntime",
+    "chromadb", "langchain_chroma", "langchain_huggingface", "langsmith",
+]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import src.api.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def test_api_import_time_and_lazy_imports():
+    """Importing src.api.main in a fresh interpreter is fast and loads no model stack."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"\nImporting src.api.main took {report['seconds'] * 1000:.0f}ms")
+
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+class FakeCollection:
+    def count(self):
+        return 3
+
+
+class FakeChroma:
+    _collection = FakeCollection()
+
+
+@pytest.fixture
+def slow_warm_up(monkeypatch):
+    """Replace the model and ChromaDB loads with a short sleep."""
+    from src.api import readiness
+
+    monkeypatch.setattr(readiness, "get_embeddings_model", lambda: time.sleep(0.5))
+    monkeypatch.setattr(readiness, "get_chroma_db", lambda: FakeChroma())
+    monkeypatch.setattr(readiness, "embed_query", lambda query: [0.0])
+    monkeypatch.setattr(readiness, "_readiness", None)
+    yield
+    monkeypatch.setattr(readiness, "_readiness", None)
+
+
+def test_ready_gate_is_separate_from_liveness(slow_warm_up):
+    """/live answers during warm-up while /ready is 503 until it finishes."""
+    from src.api.main import app
+
+    start = time.perf_counter()
+    with TestClient(app) as client:
+        live = client.get("/api/v1/live")
+        live_seconds = time.perf_counter() - start
+        not_ready = client.get("/api/v1/ready")
+
+        deadline = time.monotonic() + 5
+        ready = not_ready
+        while ready.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            ready = client.get("/api/v1/ready")
+        ready_seconds = time.perf_counter() - start
+
+    print(f"\n/live after {live_seconds * 1000:.0f}ms, /ready after {ready_seconds * 1000:.0f}ms")
+
+    assert live.status_code == 200
+    assert live_seconds < 0.5
+    assert not_ready.status_code == 503
+    assert not_ready.json()["status"] == "starting"
+    assert ready.status_code == 200
+    assert ready.json()["startup_seconds"] >= 0.5
+    assert set(ready.json()["steps"]) == {"embedding_model", "chroma", "first_query"}
+
+
+def test_embedding_dimension_read_from_config(tmp_path, monkeypatch):
+    """The dimension comes from config.json, without loading the model."""
+    from src.config import get_settings
+    from src.embedding import embedder
+
+    (tmp_path / "config.json").write_text(json.dumps({"hidden_size": 768}))
+    monkeypatch.setattr(get_settings(), "EMBEDDING_MODEL", str(tmp_path))
+    embedder.get_embedding_dimension.cache_clear()
+    try:
+        assert embedder.get_embedding_dimension() == 768
+        assert embedder._embeddings_model is None
+    finally:
+        embedder.get_embedding_dimension.cache_clear()
+
+
+def test_concurrent_first_use_loads_model_once(monkeypatch):
+    """A request racing the warm-up thread shares its model instead of loading a second one."""
+    import threading
+    from src.embedding import embedder
+
+    loads = []
+
+    def slow_load(backend, quantize=False):
+        loads.append(backend)
+        time.sleep(0.2)
+        return object()
+
+    monkeypatch.setattr(embedder, "load_embeddings_model", slow_load)
+    monkeypatch.setattr(embedder, "_embeddings_model", None)
+
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(embedder.get_embeddings_model())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(model is models[0] for model in models)